@@ -1,16 +1,15 @@
 import streamlit as st
 from langgraph.graph import StateGraph, START, END
 from typing_extensions import TypedDict
-from langchain_groq import ChatGroq
-import os
+from llm_backend import make_chat_model, require_api_key
 
 
 # -------------------- Load Environment Variables --------------------
 
-os.environ["GROQ_API_KEY"] = st.secrets["GROQ_API_KEY"]
+require_api_key(secrets=st.secrets)
 
 # Initialize LLM
-llm = ChatGroq(model="qwen-2.5-32b")
+llm = make_chat_model("qwen-2.5-32b")
 
 # -------------------- Define Graph State --------------------
 class State(TypedDict):
@@ -274,62 +273,63 @@ def extract_text_from_file(file):
 
 
 # -------------------- Streamlit UI --------------------
-st.title("🚀 AI-Powered Business Pitch Evaluator")
-st.write("This app analyzes your business pitch and provides insights, clarity checks, and investor-focused improvements.")
+if __name__ == "__main__":
+    st.title("🚀 AI-Powered Business Pitch Evaluator")
+    st.write("This app analyzes your business pitch and provides insights, clarity checks, and investor-focused improvements.")
 
-uploaded_file = st.file_uploader("Upload Business Pitch (PDF)", type=["pdf"])
+    uploaded_file = st.file_uploader("Upload Business Pitch (PDF)", type=["pdf"])
 
-if uploaded_file is not None:
-    pitch_text = extract_text_from_file(uploaded_file)
-else:
-    pitch_text = st.text_area("Or enter your pitch manually:")
+    if uploaded_file is not None:
+        pitch_text = extract_text_from_file(uploaded_file)
+    else:
+        pitch_text = st.text_area("Or enter your pitch manually:")
 
-if st.button("Analyze Pitch"):
-    with st.spinner("Processing your pitch..."):
-        state = {"pitch_text": pitch_text}
-        result = workflow.invoke(state)
+    if st.button("Analyze Pitch"):
+        with st.spinner("Processing your pitch..."):
+            state = {"pitch_text": pitch_text}
+            result = workflow.invoke(state)
     
-        # Display results
-        st.subheader("📌 **Pitch Analysis Results**")
-        st.write(f"🔍 **Pitch Category:** {result['pitch_category']}")
-        st.write(f"📝 **Feedback:** {result['pitch_feedback']}")
+            # Display results
+            st.subheader("📌 **Pitch Analysis Results**")
+            st.write(f"🔍 **Pitch Category:** {result['pitch_category']}")
+            st.write(f"📝 **Feedback:** {result['pitch_feedback']}")
         
-        with st.expander("📌 Key Insights"):
-            st.write(result["key_insights"])
+            with st.expander("📌 Key Insights"):
+                st.write(result["key_insights"])
         
-        with st.expander("📌 Clarity Report"):
-            st.write(result["clarity_report"])
+            with st.expander("📌 Clarity Report"):
+                st.write(result["clarity_report"])
         
-        with st.expander("📌 Storytelling Improvements"):
-            st.write(result.get("storytelling_suggestions", "No storytelling enhancements needed."))
+            with st.expander("📌 Storytelling Improvements"):
+                st.write(result.get("storytelling_suggestions", "No storytelling enhancements needed."))
         
-        with st.expander("📌 Persuasion Refinements"):
-            st.write(result.get("persuasive_tweaks", "No persuasion refinements needed."))
+            with st.expander("📌 Persuasion Refinements"):
+                st.write(result.get("persuasive_tweaks", "No persuasion refinements needed."))
         
-        with st.expander("📌 Investor Q&A"):
-            st.write(result["investor_questions"])
+            with st.expander("📌 Investor Q&A"):
+                st.write(result["investor_questions"])
         
-        with st.expander("📌 Final Enhanced Pitch"):
-            st.write(result["final_enhanced_pitch"])
+            with st.expander("📌 Final Enhanced Pitch"):
+                st.write(result["final_enhanced_pitch"])
 
-        st.download_button("📥 Download Enhanced Pitch", result["final_enhanced_pitch"], file_name="enhanced_pitch.txt")
-        st.markdown("### 🔗 Powered by LangGraph with Prompt Chaining Workflow 🚀")
-        st.write("This AI-driven app analyzes and improves business pitches using advanced prompt chaining techniques.")
+            st.download_button("📥 Download Enhanced Pitch", result["final_enhanced_pitch"], file_name="enhanced_pitch.txt")
+            st.markdown("### 🔗 Powered by LangGraph with Prompt Chaining Workflow 🚀")
+            st.write("This AI-driven app analyzes and improves business pitches using advanced prompt chaining techniques.")
 
 
-# ✅ Display Workflow Diagram in Sidebar
-with st.sidebar:
-    st.subheader("Workflow Diagram")
+    # ✅ Display Workflow Diagram in Sidebar
+    with st.sidebar:
+        st.subheader("Workflow Diagram")
 
-    # ✅ Generate Mermaid Workflow Diagram
-    mermaid_diagram = workflow.get_graph().draw_mermaid_png()
+        # ✅ Generate Mermaid Workflow Diagram
+        mermaid_diagram = workflow.get_graph().draw_mermaid_png()
 
-    # ✅ Save and Display the Image in Sidebar
-    image_path = "workflow_diagram.png"
-    with open(image_path, "wb") as f:
-        f.write(mermaid_diagram)
+        # ✅ Save and Display the Image in Sidebar
+        image_path = "workflow_diagram.png"
+        with open(image_path, "wb") as f:
+            f.write(mermaid_diagram)
 
-    st.image(image_path, caption="Workflow Execution")
+        st.image(image_path, caption="Workflow Execution")
 
     
 
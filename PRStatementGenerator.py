@@ -1,15 +1,14 @@
 from typing_extensions import TypedDict, Literal
-from langchain_groq import ChatGroq
+from llm_backend import make_chat_model, require_api_key
 from pydantic import BaseModel, Field
 from langgraph.graph import StateGraph, START, END
 import streamlit as st
 
-import os
 from dotenv import load_dotenv
 load_dotenv()
 
-os.environ['GROQ_API_KEY'] = os.getenv("GROQ_API_KEY")
-llm = ChatGroq(model="qwen-2.5-32b")
+require_api_key()
+llm = make_chat_model("qwen-2.5-32b")
 
 class State(TypedDict):
     pr_statement: str
@@ -79,51 +78,52 @@ optimizer_builder.add_conditional_edges(
 # Compile the workflow
 optimizer_workflow = optimizer_builder.compile()
 
-st.title("📝 AI-Powered PR Statement Generator")
+if __name__ == "__main__":
+    st.title("📝 AI-Powered PR Statement Generator")
 
-# Add sidebar with workflow diagram
-with st.sidebar:
-    st.subheader("Workflow Diagram")
+    # Add sidebar with workflow diagram
+    with st.sidebar:
+        st.subheader("Workflow Diagram")
     
-    try:
-        # Generate Mermaid Workflow Diagram
-        mermaid_diagram = optimizer_workflow.get_graph().draw_mermaid_png()
+        try:
+            # Generate Mermaid Workflow Diagram
+            mermaid_diagram = optimizer_workflow.get_graph().draw_mermaid_png()
         
-        # Save and Display the Image in Sidebar
-        image_path = "workflow_diagram.png"
-        with open(image_path, "wb") as f:
-            f.write(mermaid_diagram)
+            # Save and Display the Image in Sidebar
+            image_path = "workflow_diagram.png"
+            with open(image_path, "wb") as f:
+                f.write(mermaid_diagram)
         
-        st.image(image_path, caption="PR Statement Optimizer Workflow")
-    except Exception as e:
-        st.error(f"Unable to generate workflow diagram: {e}")
-        st.info("The workflow still functions correctly even without visualization.")
-
-# Main content area
-st.markdown("This tool automatically generates and refines PR statements until they meet quality standards.")
-topic = st.text_input("Enter the topic for the PR statement", "Company's AI-Powered Chatbot Launch")
-
-# Track generation process
-if st.button("Generate PR Statement"):
-    with st.spinner("Generating optimized PR statement..."):
-        # Create columns for showing generation progress
-        col1, col2 = st.columns(2)
+            st.image(image_path, caption="PR Statement Optimizer Workflow")
+        except Exception as e:
+            st.error(f"Unable to generate workflow diagram: {e}")
+            st.info("The workflow still functions correctly even without visualization.")
+
+    # Main content area
+    st.markdown("This tool automatically generates and refines PR statements until they meet quality standards.")
+    topic = st.text_input("Enter the topic for the PR statement", "Company's AI-Powered Chatbot Launch")
+
+    # Track generation process
+    if st.button("Generate PR Statement"):
+        with st.spinner("Generating optimized PR statement..."):
+            # Create columns for showing generation progress
+            col1, col2 = st.columns(2)
         
-        # Initialize state
-        progress_placeholder = st.empty()
-        progress_placeholder.info("Starting PR statement generation...")
+            # Initialize state
+            progress_placeholder = st.empty()
+            progress_placeholder.info("Starting PR statement generation...")
         
-        # Invoke the workflow
-        state = optimizer_workflow.invoke({"topic": topic})
+            # Invoke the workflow
+            state = optimizer_workflow.invoke({"topic": topic})
         
-        # Show success message
-        progress_placeholder.success("PR statement successfully generated!")
+            # Show success message
+            progress_placeholder.success("PR statement successfully generated!")
         
-        # Display the result
-        st.subheader("Generated PR Statement:")
-        st.write(state["pr_statement"])
+            # Display the result
+            st.subheader("Generated PR Statement:")
+            st.write(state["pr_statement"])
         
-        # Show feedback if available
-        if state.get("feedback"):
-            st.subheader("Improvement Feedback:")
-            st.info(state["feedback"])
\ No newline at end of file
+            # Show feedback if available
+            if state.get("feedback"):
+                st.subheader("Improvement Feedback:")
+                st.info(state["feedback"])
\ No newline at end of file
@@ -1,12 +1,21 @@
 import os
-import streamlit as st
 from typing_extensions import TypedDict
 from langgraph.graph import StateGraph, END, START
-from langchain_groq.chat_models import ChatGroq
+from llm_backend import get_chat_model, get_configurable, get_run_llm
 from tavily import TavilyClient
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import RunnableConfig
+from summary_cache import SummaryCache
+from chunking import estimate_tokens, split_into_chunks
+from retrieval import retrieve_relevant_sections
+from token_budget import PromptTooLargeError, TokenBudget
+from llm_cache import enable_llm_cache
+from concurrent.futures import ThreadPoolExecutor
 import re
+import threading
+from collections import Counter
+from typing import Optional
 
 ## <YHK> Each client atomatically searches for these specific keys in ENV
 
@@ -26,49 +35,198 @@ class GraphState(TypedDict):
     testcases_format: str
     testcases: str
     answer: str
+    fast_mode: bool
 
 #############################################################################
-# 2. To generate Summary of the requirements document
+# 1b. Runtime dependencies, injected through the run config
 #############################################################################
-def generate_summary_node_function(state: GraphState) -> GraphState:
+# Nodes never read st.session_state or any other per-caller global. Every
+# caller (the Streamlit page, the batch CLI, benchmarks) passes what a run
+# needs in config["configurable"], so a single compiled graph can be invoked
+# from many threads or workers at once.
+def build_run_config(llm, model_name: str = "", **options) -> dict:
     """
-    Uses LLM to generate summary of `requirements_docs_content`.
+    Run config for the compiled graph. `options` may override `summary_cache`
+    (None disables it), `summary_chunk_tokens`, `summary_max_workers`,
+    `use_retrieval` (default True) and the retrieval `embeddings`. With
+    `raise_errors=True` failed or rejected LLM calls raise instead of becoming
+    an "Error generating answer" text in the answer (headless callers).
     """
-    # print(f"YHK: inside generate_summary_node_function with state as {state}")
+    return {"configurable": {"llm": llm, "model_name": model_name, **options}}
 
-    requirements_docs_content = state.get("requirements_docs_content", "")
-    if "llm" not in st.session_state:
-        raise RuntimeError("LLM not initialized. Please call initialize_app first.")
+def _get_budget(config: Optional[RunnableConfig]) -> TokenBudget:
+    # Prompts are sized against the context window of the model in use
+    return TokenBudget(get_configurable(config, "model_name", ""))
+
+# Summaries are cached on disk per (document, model) so repeated turns over the
+# same requirements document skip the summary LLM call entirely.
+summary_cache = SummaryCache()
+
+# Documents larger than one chunk are summarized map-reduce style: chunks are
+# summarized concurrently, then the partial summaries are reduced into one.
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "3000"))
+SUMMARY_MAX_WORKERS = int(os.getenv("SUMMARY_MAX_WORKERS", "4"))
+SUMMARY_MAX_REDUCE_ROUNDS = 3
 
-    prompt = (
+#############################################################################
+# 2. To generate Summary of the requirements document
+#############################################################################
+def _summary_prompt(requirements_docs_content: str) -> str:
+    return (
     "You are an expert in generating QA testcases for any known formats. \n" + 
     "Study the given 'Requirements Documents Content' carefully and generate summary of about 5 lines\n" +
     f"Requirements Documents Content: {requirements_docs_content}\n" +
     "Answer:"
     )
-    
-    # print(f"YHK: inside generate_summary_node_function with prompt as:\n {prompt}")
+
+def _chunk_summary_prompt(chunk: str) -> str:
+    return (
+    "You are an expert in generating QA testcases for any known formats. \n" + 
+    "The following is one part of a larger 'Requirements Documents Content'.\n" +
+    "Summarize the requirements it describes in a few lines, keeping every testable behaviour.\n" +
+    f"Requirements Documents Part: {chunk}\n" +
+    "Answer:"
+    )
+
+def _reduce_summary_prompt(partial_summaries: str) -> str:
+    return (
+    "You are an expert in generating QA testcases for any known formats. \n" + 
+    "The following are summaries of consecutive parts of one 'Requirements Documents Content'.\n" +
+    "Combine them into a single summary of about 5 lines\n" +
+    f"Partial Summaries: {partial_summaries}\n" +
+    "Answer:"
+    )
+
+def _map_summaries(chunks, llm, max_workers: int):
+    # pool.map keeps the chunk order, so the reduce step sees the document in sequence
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as pool:
+        return list(pool.map(lambda chunk: llm.invoke(_chunk_summary_prompt(chunk)).content, chunks))
+
+def summarize_requirements(requirements_docs_content: str, llm,
+                           chunk_tokens: int = SUMMARY_CHUNK_TOKENS,
+                           max_workers: int = SUMMARY_MAX_WORKERS) -> str:
+    """
+    Summarize `requirements_docs_content` with a single LLM call when it fits in
+    one chunk, otherwise map-reduce it over token-bounded chunks.
+    """
+    if estimate_tokens(requirements_docs_content) <= chunk_tokens:
+        return llm.invoke(_summary_prompt(requirements_docs_content)).content
+
+    chunks = split_into_chunks(requirements_docs_content, chunk_tokens)
+    print(f"YHK: map-reduce summary over {len(chunks)} chunks with {max_workers} workers")
+    partial_summaries = _map_summaries(chunks, llm, max_workers)
+
+    # Very long documents can produce more partial summaries than fit in one
+    # reduce prompt, so collapse them in rounds until they do.
+    combined = "\n\n".join(partial_summaries)
+    rounds = 0
+    while (estimate_tokens(combined) > chunk_tokens and len(partial_summaries) > 1
+           and rounds < SUMMARY_MAX_REDUCE_ROUNDS):
+        partial_summaries = _map_summaries(split_into_chunks(combined, chunk_tokens), llm, max_workers)
+        combined = "\n\n".join(partial_summaries)
+        rounds += 1
+
+    return llm.invoke(_reduce_summary_prompt(combined)).content
+
+def generate_summary_node_function(state: GraphState, config: RunnableConfig) -> dict:
+    """
+    Uses LLM to generate summary of `requirements_docs_content`.
+    """
+    # print(f"YHK: inside generate_summary_node_function with state as {state}")
+
+    requirements_docs_content = state.get("requirements_docs_content", "")
+    llm = get_run_llm(config)
+
+    model_name = get_configurable(config, "model_name", "")
+    cache = get_configurable(config, "summary_cache", summary_cache)
+    cached_summary = cache.get(requirements_docs_content, model_name) if cache is not None else None
+    if cached_summary is not None:
+        print(f"YHK: summary cache hit for model {model_name}")
+        return {"requirements_docs_summary": cached_summary}
+
+    # Chunks never exceed what the selected model can take in one summary prompt
+    chunk_tokens = min(get_configurable(config, "summary_chunk_tokens", SUMMARY_CHUNK_TOKENS),
+                       _get_budget(config).content_budget(_chunk_summary_prompt("")))
 
     try:
-        response = st.session_state.llm.invoke(prompt)
+        summary = summarize_requirements(
+            requirements_docs_content, llm,
+            chunk_tokens=chunk_tokens,
+            max_workers=get_configurable(config, "summary_max_workers", SUMMARY_MAX_WORKERS),
+        )
+        if cache is not None:
+            cache.put(requirements_docs_content, model_name, summary)
     except Exception as e:
-        response = f"Error generating answer: {str(e)}"
+        if get_configurable(config, "raise_errors", False):
+            raise
+        # Errors are returned to the user but never cached
+        summary = f"Error generating answer: {str(e)}"
         
-    # print(f"YHK: returning from generate_summary_node_function with response as:\n {type(response)} also testcases {response.content}")
-        
-    state ['requirements_docs_summary'] = response.content
-    state ['answer'] = response.content
-    return state
+    # print(f"YHK: returning from generate_summary_node_function with summary as:\n {summary}")
+
+    # The merge node composes `answer`; this branch runs concurrently with the
+    # testcase branch, so it only writes its own key.
+    return {"requirements_docs_summary": summary}
 
 
 #############################################################################
 # 2. Router function to decide whether to output gherkin or selenium
 #############################################################################
-def route_user_request(state: GraphState) -> str:
-    # print(f"YHK: inside route_user_request with state as {state}")
-    # print(f"YHK: inside route_user_request with session state as {st.session_state}")
+# Deterministic fast path for the router. Most requests name the format or an
+# unmistakable marker of it, so the LLM is only asked when neither side (or
+# both sides) match.
+GHERKIN_PATTERNS = [
+    re.compile(r"\bgherkin\b"),
+    re.compile(r"\bcucumber\b"),
+    re.compile(r"\bbdd\b"),
+    re.compile(r"\bbehaviou?r[- ]driven\b"),
+    re.compile(r"\bfeature files?\b"),
+    re.compile(r"\bscenario outlines?\b"),
+    re.compile(r"\bgiven\b.*\bwhen\b.*\bthen\b"),
+]
+SELENIUM_PATTERNS = [
+    re.compile(r"\bselenium\b"),
+    re.compile(r"\bweb ?driver\b"),
+    re.compile(r"\bxpath\b"),
+    re.compile(r"\bcss selectors?\b"),
+    re.compile(r"\b(chrome|firefox|headless) ?(driver|browser)?\b"),
+    re.compile(r"\bbrowser automation\b"),
+    re.compile(r"\b(ui|browser|web) automation (tests?|scripts?)\b"),
+]
 
-    user_request = state["user_request"]
+router_stats = Counter()
+_router_stats_lock = threading.Lock()
+
+def classify_testcases_format(user_request: str) -> Optional[str]:
+    """
+    Returns "gherkin" or "selenium" when the request is unambiguous, else None.
+    """
+    text = user_request.lower()
+    gherkin_hits = sum(1 for pattern in GHERKIN_PATTERNS if pattern.search(text))
+    selenium_hits = sum(1 for pattern in SELENIUM_PATTERNS if pattern.search(text))
+    if gherkin_hits and not selenium_hits:
+        return "gherkin"
+    if selenium_hits and not gherkin_hits:
+        return "selenium"
+    return None
+
+def _record_route(route_path: str) -> None:
+    with _router_stats_lock:
+        router_stats[route_path] += 1
+
+def get_router_stats() -> dict:
+    """
+    Counts of requests routed by the keyword classifier vs. the LLM, plus the hit rate.
+    """
+    with _router_stats_lock:
+        keyword, llm = router_stats["keyword"], router_stats["llm"]
+    total = keyword + llm
+    return {"keyword": keyword, "llm": llm, "keyword_hit_rate": keyword / total if total else 0.0}
+
+def _route_with_llm(user_request: str, llm) -> str:
+    """
+    Slow path: asks the LLM to pick the testcase format.
+    """
     tool_selection = {
     "gherkin_format": (
         "Use requests generation of testcases in Gherkin format "
@@ -104,7 +262,7 @@ def route_user_request(state: GraphState) -> str:
     }
 
     # Invoke the chain
-    tool = (prompt | st.session_state.llm | StrOutputParser()).invoke(inputs)
+    tool = (prompt | llm | StrOutputParser()).invoke(inputs)
     # print(f"YHK: route_user_request: raw {tool} output response")
 
     tool = re.sub(r"[\\'\"`]", "", tool.strip()) # Remove any backslashes and extra spaces
@@ -115,14 +273,35 @@ def route_user_request(state: GraphState) -> str:
         tool = "gherkin"
     else:
         tool = "selenium"
-        
-    state["testcases_format"] = tool
+    return tool
+
+def route_user_request(state: GraphState, config: RunnableConfig) -> str:
+    # print(f"YHK: inside route_user_request with state as {state}")
+
+    user_request = state["user_request"]
+    tool = classify_testcases_format(user_request)
+    if tool is not None:
+        route_path = "keyword"
+    else:
+        tool = _route_with_llm(user_request, get_run_llm(config))
+        route_path = "llm"
+    _record_route(route_path)
     
-    print(f"YHK: returning from route_user_request with tool as: {tool}")
+    print(f"YHK: returning from route_user_request with tool as: {tool} via {route_path} path")
     return tool
 
-def generate_testcases(user_request, requirements_content, llm, format_type):
-    prompt = (
+def route_parallel_branches(state: GraphState, config: RunnableConfig) -> list:
+    """
+    Fans out to the summary branch and the format-specific testcase branch so
+    both LLM calls run concurrently. Fast mode skips the summary entirely.
+    """
+    branches = [route_user_request(state, config)]
+    if not state.get("fast_mode", False):
+        branches.append("summary")
+    return branches
+
+def _testcases_prompt(user_request, requirements_content, format_type) -> str:
+    return (
     "You are an expert in generating QA testcases for any known formats. \n" + 
     "Study the given 'Requirements Documents Content' carefully and generate about 3 testcases in the suggested 'Format'\n" +
     "You may want to look at the original User Request just to make sure that you are ansering th request properly.\n" +
@@ -131,105 +310,188 @@ def generate_testcases(user_request, requirements_content, llm, format_type):
     f"Format: {format_type}\n" +
     "Answer:"
     )
+
+def generate_testcases(user_request, requirements_content, llm, format_type, budget: Optional[TokenBudget] = None,
+                       raise_errors: bool = False):
+    try:
+        if budget is not None:
+            # Compress or trim the document to the model's context, or reject the
+            # request here instead of after a full upload to the provider
+            requirements_content = budget.fit_content(
+                requirements_content, overhead_text=_testcases_prompt(user_request, "", format_type))
+    except PromptTooLargeError as e:
+        if raise_errors:
+            raise
+        return f"Request rejected before calling the model: {e}"
+
+    prompt = _testcases_prompt(user_request, requirements_content, format_type)
     
     # print(f"YHK: inside generate_testcases with prompt as:\n {prompt}")
 
     try:
-        response = llm.invoke(prompt)
+        testcases = llm.invoke(prompt).content
     except Exception as e:
-        response = f"Error generating answer: {str(e)}"
+        if raise_errors:
+            raise
+        testcases = f"Error generating answer: {str(e)}"
         
-    # print(f"YHK: returning from generate_testcases with response as:\n {type(response)} also testcases {response.content}")
+    # print(f"YHK: returning from generate_testcases with testcases as:\n {testcases}")
         
-    return response.content
+    return testcases
+
+def _relevant_requirements(user_request: str, requirements_docs_content: str, config: RunnableConfig) -> str:
+    """
+    Narrows the requirements to the sections relevant to `user_request`, so the
+    testcase prompt does not carry the whole document (see retrieval.py).
+    """
+    if not get_configurable(config, "use_retrieval", True):
+        return requirements_docs_content
+    try:
+        return retrieve_relevant_sections(requirements_docs_content, user_request,
+                                          embeddings=get_configurable(config, "embeddings"))
+    except Exception as e:
+        print(f"YHK: retrieval failed, using the full document: {e}")
+        return requirements_docs_content
 
 #############################################################################
 # 3. To generate Gherikin formatted Testcases
 #############################################################################
-def generate_gherkin_testcases_node_function(state: GraphState) -> GraphState:
+def generate_gherkin_testcases_node_function(state: GraphState, config: RunnableConfig) -> dict:
     """
     Uses LLM to generate Gherikin formatted Testcases of `requirements_docs_content`.
     """
     # print(f"YHK: inside generate_gherkin_testcases with state as {state}")
 
     user_request = state["user_request"]
-    requirements_docs_content = state.get("requirements_docs_content", "")
-    testcases_format = state.get("testcases_format", "gherkin")
-    if "llm" not in st.session_state:
-        raise RuntimeError("LLM not initialized. Please call initialize_app first.")
+    requirements_docs_content = _relevant_requirements(user_request, state.get("requirements_docs_content", ""), config)
+    testcases_format = "gherkin"
 
-    response = generate_testcases(user_request, requirements_docs_content,st.session_state.llm, testcases_format)
+    response = generate_testcases(user_request, requirements_docs_content, get_run_llm(config), testcases_format,
+                                  budget=_get_budget(config),
+                                  raise_errors=get_configurable(config, "raise_errors", False))
     
-    state ['testcases'] = response
-    state ['answer'] = response
-    return state
+    return {"testcases_format": testcases_format, "testcases": response}
 
 
 #############################################################################
 # 4. To generate Selenium formatted Testcase
 #############################################################################
-def generate_selenium_testcases_node_function(state: GraphState) -> GraphState:
+def generate_selenium_testcases_node_function(state: GraphState, config: RunnableConfig) -> dict:
     """
     Uses LLM to generate Selenium formatted Testcases of `requirements_docs_summary`.
     """    
     # print(f"YHK: inside generate_selenium_testcases with state as {state}")
     
     user_request = state["user_request"]
-    requirements_docs_content = state.get("requirements_docs_content", "")
-    testcases_format = state.get("testcases_format", "selenium")
-    if "llm" not in st.session_state:
-        raise RuntimeError("LLM not initialized. Please call initialize_app first.")
+    requirements_docs_content = _relevant_requirements(user_request, state.get("requirements_docs_content", ""), config)
+    testcases_format = "selenium"
 
-    response = generate_testcases(user_request, requirements_docs_content,st.session_state.llm, testcases_format)
+    response = generate_testcases(user_request, requirements_docs_content, get_run_llm(config), testcases_format,
+                                  budget=_get_budget(config),
+                                  raise_errors=get_configurable(config, "raise_errors", False))
     
-    state ['testcases'] = response
-    state ['answer'] = response
-    return state
+    return {"testcases_format": testcases_format, "testcases": response}
 
 
 #############################################################################
-# 5. Build the LangGraph pipeline
+# 5. Merge the parallel branches into the final answer
+#############################################################################
+def merge_answer_node_function(state: GraphState) -> dict:
+    """
+    Joins the summary (when it was generated) and the testcases into `answer`.
+    """
+    parts = [state.get("requirements_docs_summary", ""), state.get("testcases", "")]
+    return {"answer": "\n\n".join(part for part in parts if part)}
+
+
+#############################################################################
+# 6. Build the LangGraph pipeline
 #############################################################################
 workflow = StateGraph(GraphState)
 # Add nodes
 workflow.add_node("summary_node", generate_summary_node_function)
 workflow.add_node("gherkin_node", generate_gherkin_testcases_node_function)
 workflow.add_node("selenium_node", generate_selenium_testcases_node_function)
-# Start with summary node
-# Then route from "route_user_request" to either "gherkin_node" or "selenium_node"
-# From "gherkin_testcases" -> END
-# From "geselenium_testcasesnerate" -> END 
+workflow.add_node("merge_node", merge_answer_node_function)
+# From START fan out to "summary_node" and, via "route_user_request", to
+# either "gherkin_node" or "selenium_node"; both branches run concurrently
+# From both branches -> "merge_node" -> END
 
 # Add the Edges
-# workflow.add_edge(START, "summary_node")
-workflow.set_entry_point("summary_node")
-
 workflow.add_conditional_edges(
-    "summary_node",
-    route_user_request,  # The router function, its output decides which node to go to
+    START,
+    route_parallel_branches,  # Returns every branch to run in parallel
     {
+        "summary": "summary_node",
         "gherkin": "gherkin_node",
         "selenium": "selenium_node"
     }
 )
-workflow.add_edge("gherkin_node", END)
-workflow.add_edge("selenium_node", END)
+workflow.add_edge("summary_node", "merge_node")
+workflow.add_edge("gherkin_node", "merge_node")
+workflow.add_edge("selenium_node", "merge_node")
+workflow.add_edge("merge_node", END)
+
+# Nodes whose LLM tokens are streamed to the user as they are generated
+TESTCASE_NODES = ("gherkin_node", "selenium_node")
+
+def stream_answer(app, inputs: dict, config: Optional[RunnableConfig] = None):
+    """
+    Runs the compiled graph and yields ("token", text) for every testcase token
+    as the LLM produces it, then ("answer", text) once the branches are merged.
+    """
+    for mode, payload in app.stream(inputs, config=config, stream_mode=["messages", "updates"]):
+        if mode == "messages":
+            chunk, metadata = payload
+            if metadata.get("langgraph_node") in TESTCASE_NODES and isinstance(chunk.content, str) and chunk.content:
+                yield "token", chunk.content
+        else:
+            for node_name, update in payload.items():
+                if update and "answer" in update:
+                    yield "answer", update["answer"]
 
 #############################################################################
-# 6. The initialize_app function
+# 7. Process-wide registry of the compiled graph and LLM clients
 #############################################################################
-def initialize_app(model_name: str):
+# Streamlit reruns the page script on every interaction, but this module is
+# imported once per process. Compiling the graph here, once, lets every rerun
+# and every session reuse it; LLM clients are shared through llm_backend.
+_registry_lock = threading.Lock()
+_compiled_app = None
+
+# Identical prompts (same model, parameters and text) are answered from the
+# shared SQLite response cache instead of another paid round trip
+enable_llm_cache()
+
+def get_compiled_app():
+    """
+    Returns the compiled workflow, compiling it on first use only.
+    """
+    global _compiled_app
+    if _compiled_app is None:
+        with _registry_lock:
+            if _compiled_app is None:
+                _compiled_app = workflow.compile()
+    return _compiled_app
+
+def get_llm(model_name: str, temperature: float = 0.0):
     """
-    Initialize the app with the given model name, avoiding redundant initialization.
+    Returns the shared LLM client for `model_name`, creating it on first use.
     """
-    # Check if the LLM is already initialized
-    if "selected_model" in st.session_state and st.session_state.selected_model == model_name:
-        return workflow.compile()  # Return the compiled workflow directly
+    return get_chat_model(model_name, temperature=temperature)
 
-    # Initialize the LLM for the first time or switch models
-    st.session_state.llm = ChatGroq(model=model_name, temperature=0.0)
-    st.session_state.selected_model = model_name
-    print(f"Using model: {model_name}")
-    print(f"Using state: {st.session_state.llm}")
-    return workflow.compile()
+#############################################################################
+# 8. The initialize_app function
+#############################################################################
+def initialize_app(model_name: str):
+    """
+    Point the Streamlit session at the shared LLM for `model_name` and return the
+    shared compiled graph. Run it with config=build_run_config(st.session_state.llm, model_name).
+    """
+    # Only the Streamlit entry point needs streamlit; headless callers never import it
+    import streamlit as st
 
+    st.session_state.llm = get_llm(model_name)
+    if st.session_state.get("selected_model") != model_name:
+        st.session_state.selected_model = model_name
+    return get_compiled_app()
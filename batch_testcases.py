@@ -0,0 +1,133 @@
+"""
+Headless batch test-case generation over the agent.py graph.
+
+Reads jobs from a JSONL file, one job per line:
+
+    {"id": "login", "user_request": "Gherkin tests for login", "document": "docs/login.pdf"}
+
+`document` paths are resolved relative to the jobs file; `id` defaults to the
+line number and `fast_mode` (skip the summary) defaults to false. With
+`--output -` the results go to stdout and all log output to stderr. Jobs run
+concurrently up to --concurrency and each result is written as one JSONL
+line as soon as it finishes, so partial output survives an interrupted run.
+A failing job produces an error record and never stops the batch.
+
+    python batch_testcases.py jobs.jsonl --output results.jsonl --concurrency 8
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from dotenv import load_dotenv
+
+import agent
+from doc_ingest import load_path
+
+DEFAULT_MODEL = "llama-3.1-8b-instant"
+
+
+def read_jobs(jobs_path: str):
+    """
+    Yields (job, parse_error) pairs; malformed lines become error jobs instead of aborting.
+    """
+    base_dir = os.path.dirname(os.path.abspath(jobs_path))
+    with open(jobs_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                job = json.loads(line)
+                if not isinstance(job, dict):
+                    raise ValueError("job must be a JSON object")
+                job["id"] = str(job.get("id", line_number))
+                for field in ("user_request", "document"):
+                    if not isinstance(job.get(field), str) or not job[field].strip():
+                        raise ValueError(f"job needs a non-empty string '{field}'")
+                if not isinstance(job.get("fast_mode", False), bool):
+                    raise ValueError("'fast_mode' must be true or false")
+                job["document"] = os.path.join(base_dir, job["document"])
+                yield job, None
+            except (ValueError, TypeError) as e:
+                yield {"id": str(line_number)}, f"Invalid job on line {line_number}: {e}"
+
+
+def run_job(app, job: dict, config: dict) -> dict:
+    started = time.perf_counter()
+    try:
+        inputs = {
+            "user_request": job["user_request"],
+            "requirements_docs_content": load_path(job["document"]),
+            "fast_mode": bool(job.get("fast_mode", False)),
+        }
+        final_state = app.invoke(inputs, config=config)
+        return {
+            "id": job["id"],
+            "status": "ok",
+            "testcases_format": final_state.get("testcases_format", ""),
+            "answer": final_state.get("answer", ""),
+            "elapsed_s": round(time.perf_counter() - started, 3),
+        }
+    except Exception as e:
+        return {
+            "id": job["id"],
+            "status": "error",
+            "error": f"{type(e).__name__}: {e}",
+            "elapsed_s": round(time.perf_counter() - started, 3),
+        }
+
+
+def _run_jobs(app, config: dict, args, out, counts: dict):
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+        futures = []
+        for job, parse_error in read_jobs(args.jobs):
+            if parse_error:
+                result = {"id": job["id"], "status": "error", "error": parse_error, "elapsed_s": 0.0}
+                counts["error"] += 1
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+                continue
+            futures.append(pool.submit(run_job, app, job, config))
+
+        for future in as_completed(futures):
+            result = future.result()
+            counts[result["status"]] += 1
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            print(f"[{result['status']}] job {result['id']} in {result['elapsed_s']}s", file=sys.stderr)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("jobs", help="JSONL file with one job per line")
+    parser.add_argument("--output", default="testcase_results.jsonl",
+                        help="JSONL results file (default testcase_results.jsonl); '-' writes to stdout "
+                             "(log lines then go to stderr)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum jobs in flight (default 4)")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help=f"Groq model name (default {DEFAULT_MODEL})")
+    args = parser.parse_args(argv)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    counts = {"ok": 0, "error": 0}
+    # The agent's log lines are plain prints; keep them out of the JSONL results
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            load_dotenv()
+            app = agent.get_compiled_app()
+            # Provider errors and rejected prompts fail the job instead of ending up in its answer
+            config = agent.build_run_config(agent.get_llm(args.model), args.model, raise_errors=True)
+            _run_jobs(app, config, args, out, counts)
+    finally:
+        if args.output != "-":
+            out.close()
+
+    print(f"Done: {counts['ok']} ok, {counts['error']} failed", file=sys.stderr)
+    return 0 if counts["error"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Per-rerun setup overhead of the test-case generation app, before and after
+the process-wide graph/LLM registry in agent.py.
+
+"before" repeats what every Streamlit rerun used to do: compile the workflow
+and build a fresh ChatGroq client. "after" is what initialize_app does now:
+two registry lookups. No LLM calls are made.
+
+    python benchmarks/bench_initialize_app.py --iterations 200
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# ChatGroq only needs a key to construct its client; nothing is sent.
+os.environ.setdefault("GROQ_API_KEY", "benchmark-placeholder")
+
+from langchain_groq.chat_models import ChatGroq  # noqa: E402
+
+import agent  # noqa: E402
+
+MODEL_NAME = "llama-3.1-8b-instant"
+
+
+def _time_per_call(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def rerun_before():
+    agent.workflow.compile()
+    ChatGroq(model=MODEL_NAME, temperature=0.0)
+
+
+def rerun_after():
+    agent.get_compiled_app()
+    agent.get_llm(MODEL_NAME)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    # Warm both paths once so imports and the first compile are not counted
+    rerun_before()
+    rerun_after()
+
+    before = _time_per_call(rerun_before, args.iterations)
+    after = _time_per_call(rerun_after, args.iterations)
+
+    print(f"iterations:            {args.iterations}")
+    print(f"per rerun, before:     {before * 1000:.3f} ms (compile + new ChatGroq)")
+    print(f"per rerun, after:      {after * 1000:.4f} ms (registry lookups)")
+    print(f"speedup:               {before / after:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
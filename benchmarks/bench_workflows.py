@@ -0,0 +1,277 @@
+"""
+Per-node benchmark of every LangGraph workflow in the repo.
+
+Each compiled graph is driven with fixed inputs against the offline fake LLM
+(LLM_BACKEND=fake, the default here) or a replayed cassette, and a callback
+handler records, for every node: executions, wall time, LLM calls,
+prompt/completion tokens and peak traced memory. Results are written as JSON
+so runs on two commits can be diffed; a summary table goes to stdout.
+
+    python benchmarks/bench_workflows.py --iterations 5 --output bench_workflows.json
+    FAKE_LLM_LATENCY_S=0.05 python benchmarks/bench_workflows.py --workflows sdlc
+
+To replay a recorded run instead (see llm_cassette.py):
+
+    LLM_BACKEND=replay LLM_CASSETTE=sdlc.jsonl LLM_REPLAY_LATENCY=zero \
+        python benchmarks/bench_workflows.py --workflows sdlc --iterations 1
+
+Peak memory is measured with tracemalloc and is process-wide, so nodes that
+run in parallel (agent.py fans out) share each other's allocations.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Offline and uncached by default: cache hits would hide the LLM calls being measured
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("LLM_CACHE_DISABLED", "1")
+# Benchmark runs are checkpointed like real ones, but not into the app's run database
+os.environ.setdefault("SDLC_CHECKPOINT_DB", os.path.join(tempfile.gettempdir(), "bench_sdlc_checkpoints.sqlite"))
+
+from langchain_core.callbacks import BaseCallbackHandler  # noqa: E402
+
+REQUIREMENTS = """Users can register with an email address and a password.
+Registered users can log in, log out and reset a forgotten password by email.
+Logged-in users can see their order history and download invoices as PDF.
+Administrators can deactivate user accounts."""
+
+PITCH = """We build an AI assistant for small accounting firms that drafts client
+reports from bookkeeping data. Firms pay 49 EUR per seat per month. There are
+40,000 such firms in the EU; our two founders ran an accounting practice for
+ten years. We are raising 1.2M EUR to grow from 30 to 500 paying firms."""
+
+
+class NodeMetrics(BaseCallbackHandler):
+    """
+    Aggregates wall time, LLM calls, token usage and peak memory per graph node.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._node_runs = {}
+        self._llm_runs = {}
+        self.nodes = defaultdict(lambda: {
+            "calls": 0,
+            "wall_s": 0.0,
+            "llm_calls": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "peak_memory_bytes": 0,
+        })
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, name=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        # Chains inside a node inherit its metadata; only the node's own run is timed
+        if node is None or name != node:
+            return
+        tracemalloc.reset_peak()
+        with self._lock:
+            self._node_runs[run_id] = (node, time.perf_counter(), tracemalloc.get_traced_memory()[0])
+
+    def _end_node(self, run_id):
+        with self._lock:
+            started = self._node_runs.pop(run_id, None)
+            if started is None:
+                return
+            node, start_time, start_memory = started
+            stats = self.nodes[node]
+            stats["calls"] += 1
+            stats["wall_s"] += time.perf_counter() - start_time
+            peak = tracemalloc.get_traced_memory()[1] - start_memory
+            stats["peak_memory_bytes"] = max(stats["peak_memory_bytes"], peak)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end_node(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end_node(run_id)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node", "<outside graph>")
+        with self._lock:
+            self._llm_runs[run_id] = node
+            self.nodes[node]["llm_calls"] += 1
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        with self._lock:
+            node = self._llm_runs.pop(run_id, None)
+            if node is None:
+                return
+            for generations in response.generations:
+                for generation in generations:
+                    usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                    self.nodes[node]["prompt_tokens"] += usage.get("input_tokens", 0)
+                    self.nodes[node]["completion_tokens"] += usage.get("output_tokens", 0)
+
+
+# -------------------- Workflows under test --------------------
+# Each loader imports the module lazily and returns (graph builder, compiled
+# graph, inputs, config, setup); module imports build the module-level LLM
+# clients. `setup` is what a caller does before every run (registry lookups),
+# or None when the module only has module-level globals.
+
+def _load_agent():
+    import agent
+    config = agent.build_run_config(agent.get_llm("llama-3.1-8b-instant"), "llama-3.1-8b-instant",
+                                    summary_cache=None, use_retrieval=False)
+    inputs = {
+        "user_request": "Generate gherkin test cases for login and password reset",
+        "requirements_docs_content": REQUIREMENTS,
+        "fast_mode": False,
+    }
+    setup = lambda: (agent.get_compiled_app(), agent.get_llm("llama-3.1-8b-instant"))
+    return agent.workflow, agent.get_compiled_app(), inputs, config, setup
+
+
+def _load_customer_query():
+    import customerquery
+    inputs = {"input": "I was charged twice for my monthly subscription"}
+    return customerquery.graph, customerquery.customer_query_workflow, inputs, {}, None
+
+
+def _load_business_pitch():
+    import Businesspitch
+    return Businesspitch.graph, Businesspitch.workflow, {"pitch_text": PITCH}, {}, None
+
+
+def _load_pr_statement():
+    import PRStatementGenerator
+    inputs = {"topic": "Company's AI-Powered Chatbot Launch"}
+    return PRStatementGenerator.optimizer_builder, PRStatementGenerator.optimizer_workflow, inputs, {}, None
+
+
+def _load_sdlc():
+    import sdlc_workflow
+    app = sdlc_workflow.get_sdlc_app()
+    from ui_events import discard_event
+    # Node output is not rendered, so the timings measure the nodes alone
+    config = sdlc_workflow.build_run_config(sdlc_workflow.get_llm(), events=discard_event)
+    setup = lambda: (sdlc_workflow.get_sdlc_app(), sdlc_workflow.get_llm())
+    return app.builder, app, {"user_requirements": REQUIREMENTS}, config, setup
+
+
+WORKFLOWS = {
+    "agent": _load_agent,
+    "customer_query": _load_customer_query,
+    "business_pitch": _load_business_pitch,
+    "pr_statement": _load_pr_statement,
+    "sdlc": _load_sdlc,
+}
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def bench_workflow(name: str, iterations: int) -> dict:
+    # Cold construction: module import, prompts, LLM clients and the first compile
+    start = time.perf_counter()
+    builder, app, inputs, config, setup = WORKFLOWS[name]()
+    load_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    builder.compile()
+    compile_s = time.perf_counter() - start
+
+    setup_s = 0.0
+    if setup is not None:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            setup()
+        setup_s = (time.perf_counter() - start) / iterations
+
+    metrics = NodeMetrics()
+    run_config = dict(config, callbacks=config.get("callbacks", []) + [metrics])
+    wall_times = []
+    tracemalloc.start()
+    try:
+        for _ in range(iterations):
+            if "thread_id" in run_config.get("configurable", {}):
+                # A fresh checkpointed run each time, so no state (e.g. memoized reviews) carries over
+                run_config["configurable"] = dict(run_config["configurable"], thread_id=f"bench-{uuid.uuid4().hex[:12]}")
+            start = time.perf_counter()
+            app.invoke(inputs, config=run_config)
+            wall_times.append(time.perf_counter() - start)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    nodes = {}
+    for node, stats in sorted(metrics.nodes.items()):
+        nodes[node] = dict(stats, wall_s=round(stats["wall_s"], 6),
+                           wall_s_mean=round(stats["wall_s"] / stats["calls"], 6) if stats["calls"] else 0.0)
+    return {
+        "iterations": iterations,
+        "load_s": round(load_s, 6),
+        "compile_s": round(compile_s, 6),
+        "setup_s": round(setup_s, 9),
+        "wall_s_mean": round(sum(wall_times) / len(wall_times), 6),
+        "wall_s_min": round(min(wall_times), 6),
+        "wall_s_max": round(max(wall_times), 6),
+        "llm_calls": sum(stats["llm_calls"] for stats in nodes.values()),
+        "prompt_tokens": sum(stats["prompt_tokens"] for stats in nodes.values()),
+        "completion_tokens": sum(stats["completion_tokens"] for stats in nodes.values()),
+        "peak_memory_bytes": peak_memory,
+        "nodes": nodes,
+    }
+
+
+def print_summary(results: dict) -> None:
+    for name, result in results["workflows"].items():
+        print(f"\n{name}: {result['wall_s_mean'] * 1000:.1f} ms/run, load {result['load_s'] * 1000:.1f} ms, "
+              f"compile {result['compile_s'] * 1000:.1f} ms, per-run setup {result['setup_s'] * 1000:.4f} ms, "
+              f"{result['llm_calls']} LLM calls, peak {result['peak_memory_bytes'] / 1024:.0f} KiB")
+        print(f"  {'node':<50} {'calls':>5} {'ms/call':>9} {'llm':>4} {'prompt':>7} {'compl':>6} {'peak KiB':>9}")
+        for node, stats in result["nodes"].items():
+            print(f"  {node:<50} {stats['calls']:>5} {stats['wall_s_mean'] * 1000:>9.2f} {stats['llm_calls']:>4} "
+                  f"{stats['prompt_tokens']:>7} {stats['completion_tokens']:>6} "
+                  f"{stats['peak_memory_bytes'] / 1024:>9.0f}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workflows", nargs="+", choices=sorted(WORKFLOWS), default=list(WORKFLOWS))
+    parser.add_argument("--iterations", type=int, default=3, help="Runs per workflow (default 3)")
+    parser.add_argument("--output", default="bench_workflows.json", help="JSON results file")
+    args = parser.parse_args(argv)
+
+    results = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "llm_backend": os.environ["LLM_BACKEND"],
+            "fake_llm_latency_s": os.getenv("FAKE_LLM_LATENCY_S", ""),
+            "fake_llm_tokens_per_s": os.getenv("FAKE_LLM_TOKENS_PER_S", ""),
+            "llm_cassette": os.getenv("LLM_CASSETTE", ""),
+            "llm_replay_latency": os.getenv("LLM_REPLAY_LATENCY", ""),
+        },
+        "workflows": {},
+    }
+    for name in args.workflows:
+        results["workflows"][name] = bench_workflow(name, max(1, args.iterations))
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print_summary(results)
+    print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Token-bounded text chunking for requirements documents.
+
+Token counts are estimated locally (about 4 characters per token for English
+text) so chunking never needs a tokenizer download or a network call.
+"""
+import math
+import re
+from typing import List
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap, slightly pessimistic token estimate for `text`.
+    """
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _hard_split(text: str, max_chars: int) -> List[str]:
+    return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+
+
+def split_into_chunks(text: str, max_tokens: int) -> List[str]:
+    """
+    Split `text` into chunks of at most `max_tokens` estimated tokens.
+
+    Paragraph boundaries are preferred, then line boundaries; only a single
+    oversized line is cut mid-text.
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive")
+    max_chars = max_tokens * CHARS_PER_TOKEN
+
+    pieces = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for line in paragraph.splitlines():
+            if len(line) <= max_chars:
+                pieces.append(line)
+            else:
+                pieces.extend(_hard_split(line, max_chars))
+
+    chunks = []
+    current = []
+    current_len = 0
+    for piece in pieces:
+        if not piece.strip():
+            continue
+        # +2 for the paragraph separator added back on join
+        if current and current_len + len(piece) + 2 > max_chars:
+            chunks.append("\n\n".join(current))
+            current = []
+            current_len = 0
+        current.append(piece)
+        current_len += len(piece) + 2
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
@@ -0,0 +1,107 @@
+"""
+Targeted code edits for the SDLC fix nodes.
+
+Instead of re-emitting the whole program on every review round, the model
+answers with SEARCH/REPLACE edit blocks:
+
+    <<<<<<< SEARCH
+    def login(user, password):
+        return db.check(user, password)
+    =======
+    def login(user: str, password: str) -> bool:
+        return db.check(user, hash_password(password))
+    >>>>>>> REPLACE
+
+Blocks are applied locally and validated; anything that does not apply
+cleanly raises PatchError so the caller can fall back to full regeneration.
+"""
+import ast
+import re
+
+from static_checks import python_source
+
+_BLOCK_RE = re.compile(
+    r"^[ \t]*<{5,9} ?SEARCH[ \t]*\n(.*?)^[ \t]*={5,9}[ \t]*\n(.*?)^[ \t]*>{5,9} ?REPLACE[ \t]*$",
+    re.MULTILINE | re.DOTALL,
+)
+
+
+class PatchError(ValueError):
+    pass
+
+
+def parse_edit_blocks(response: str) -> list:
+    """
+    Returns the (search, replace) pairs in a model response, in order.
+    """
+    return [(search, replace) for search, replace in _BLOCK_RE.findall(response)]
+
+
+def _find_lines(code: str, search: str) -> tuple:
+    """
+    Locates `search` in `code`, first exactly, then line by line ignoring
+    trailing whitespace. Returns the (start, end) character span.
+    """
+    position = code.find(search)
+    if position != -1:
+        if code.find(search, position + 1) != -1:
+            raise PatchError(f"SEARCH block matches more than once: {search.strip()[:60]!r}")
+        return position, position + len(search)
+
+    code_lines = code.splitlines(keepends=True)
+    search_lines = [line.rstrip() for line in search.splitlines()]
+    while search_lines and not search_lines[-1]:
+        search_lines.pop()
+    if not search_lines:
+        raise PatchError("Empty SEARCH block")
+
+    matches = [
+        i for i in range(len(code_lines) - len(search_lines) + 1)
+        if all(code_lines[i + j].rstrip() == search_lines[j] for j in range(len(search_lines)))
+    ]
+    if not matches:
+        raise PatchError(f"SEARCH block not found: {search.strip()[:60]!r}")
+    if len(matches) > 1:
+        raise PatchError(f"SEARCH block matches more than once: {search.strip()[:60]!r}")
+    start = sum(len(line) for line in code_lines[:matches[0]])
+    end = start + sum(len(line) for line in code_lines[matches[0]:matches[0] + len(search_lines)])
+    return start, end
+
+
+def _parses_as_python(code: str) -> bool:
+    # Generated code is usually wrapped in a ```python fence; only its Python is parsed
+    source, _ = python_source(code)
+    if source is None:
+        return False
+    try:
+        ast.parse(source)
+        return True
+    except (SyntaxError, ValueError):
+        return False
+
+
+def apply_edit_blocks(code: str, blocks: list) -> str:
+    """
+    Applies (search, replace) blocks to `code` one after the other.
+
+    Raises PatchError when there are no blocks, a block does not match exactly
+    one place, or the result no longer parses although the original did.
+    """
+    if not blocks:
+        raise PatchError("No edit blocks in the response")
+    patched = code
+    for search, replace in blocks:
+        start, end = _find_lines(patched, search)
+        if patched[start:end].endswith("\n") and replace and not replace.endswith("\n"):
+            replace += "\n"
+        patched = patched[:start] + replace + patched[end:]
+    if _parses_as_python(code) and not _parses_as_python(patched):
+        raise PatchError("Patched code is no longer valid Python")
+    return patched
+
+
+def apply_edit_response(code: str, response: str) -> str:
+    """
+    Parses a model response and applies its edit blocks to `code`.
+    """
+    return apply_edit_blocks(code, parse_edit_blocks(response))
@@ -0,0 +1,181 @@
+"""
+Local execution of generated code and tests for the SDLC "QA Testing" node.
+
+The code is written to `solution.py` and the tests to `test_solution.py` in a
+fresh temporary directory. A small harness runs all `test_*` functions one
+after another in a single child Python process (a test that crashes or hangs
+the process fails the whole run), with:
+
+- an isolated interpreter (-I) and a minimal environment, cwd = the workspace;
+- resource limits on CPU time, memory, file size and open files (POSIX only);
+- a wall-clock timeout, after which the whole process group is killed.
+
+At most SDLC_TEST_MAX_PROCS runs execute at once, shared by every session in
+the process. This is damage control for model-written code, not a security
+boundary: there is no network or filesystem isolation beyond the above. The
+code would run on the host serving the app, so execution is off unless
+SDLC_EXECUTE_TESTS=1; shared deployments should leave it off, and QA then
+falls back to an LLM review.
+"""
+import ast
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from static_checks import python_source
+
+EXECUTE_TESTS = os.getenv("SDLC_EXECUTE_TESTS", "0").lower() in ("1", "true", "yes")
+TEST_TIMEOUT_S = float(os.getenv("SDLC_TEST_TIMEOUT_S", "30"))
+TEST_CPU_S = int(os.getenv("SDLC_TEST_CPU_S", "10"))
+TEST_MEMORY_MB = int(os.getenv("SDLC_TEST_MEMORY_MB", "512"))
+MAX_TEST_PROCS = int(os.getenv("SDLC_TEST_MAX_PROCS", str(min(4, os.cpu_count() or 1))))
+# Keep this much of the process output for the QA feedback
+OUTPUT_TAIL_CHARS = 2000
+
+PASSED = "passed"
+FAILED = "failed"
+# The tests could not run here at all (e.g. a third-party import is missing)
+UNAVAILABLE = "unavailable"
+
+# Limits are applied by the child itself, before it imports any generated code
+_HARNESS = r'''
+import importlib, json, os, sys, time, traceback
+try:
+    import resource
+    for limit, value in ((resource.RLIMIT_CPU, {cpu_s}), (resource.RLIMIT_AS, {memory_bytes}),
+                         (resource.RLIMIT_FSIZE, 10 * 1024 * 1024), (resource.RLIMIT_NOFILE, 64)):
+        resource.setrlimit(limit, (value, value))
+except ImportError:
+    pass
+sys.path.insert(0, os.getcwd())
+results = []
+def finish(collection_error=None):
+    with open(sys.argv[1], "w", encoding="utf-8") as f:
+        json.dump({"tests": results, "collection_error": collection_error}, f)
+try:
+    module = importlib.import_module("test_solution")
+except BaseException as e:
+    finish({"type": type(e).__name__, "message": "".join(traceback.format_exception_only(type(e), e)).strip()})
+    sys.exit(0)
+for name, test in list(vars(module).items()):
+    if not name.startswith("test") or not callable(test) or getattr(test, "__module__", None) != module.__name__:
+        continue
+    start = time.perf_counter()
+    try:
+        test()
+        outcome, message = "passed", ""
+    except AssertionError as e:
+        outcome, message = "failed", str(e) or "assert failed: " + (traceback.extract_tb(e.__traceback__)[-1].line or "")
+    except BaseException as e:
+        outcome, message = "error", "".join(traceback.format_exception_only(type(e), e)).strip()
+    results.append({"name": name, "outcome": outcome, "message": message[:500],
+                    "duration_s": round(time.perf_counter() - start, 4)})
+finish()
+'''
+
+_slots = threading.BoundedSemaphore(max(1, MAX_TEST_PROCS))
+
+
+def extract_python(text: str) -> str:
+    """
+    Returns the Python source in an LLM answer (see static_checks.python_source),
+    or "" when it only holds code in other languages.
+    """
+    source, _ = python_source(text)
+    return source or ""
+
+
+def is_python(source: str) -> bool:
+    try:
+        ast.parse(source)
+        return True
+    except (SyntaxError, ValueError):
+        return False
+
+
+def _run_process(workspace: str, report_path: str) -> tuple:
+    """
+    Runs the harness in `workspace`; returns (exit code or None on timeout, output).
+    """
+    env = {"PATH": os.environ.get("PATH", ""), "HOME": workspace, "TMPDIR": workspace,
+           "PYTHONDONTWRITEBYTECODE": "1", "PYTHONHASHSEED": "0"}
+    process = subprocess.Popen(
+        [sys.executable, "-I", "_harness.py", report_path],
+        cwd=workspace, env=env, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        # Own process group, so a timeout also kills anything the tests started
+        start_new_session=True,
+    )
+    try:
+        output, _ = process.communicate(timeout=TEST_TIMEOUT_S)
+        return process.returncode, output.decode("utf-8", "replace")
+    except subprocess.TimeoutExpired:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+        output, _ = process.communicate()
+        return None, output.decode("utf-8", "replace")
+
+
+def run_tests(code: str, tests: str) -> dict:
+    """
+    Runs the `test_*` functions of `tests` against `code` (importable as
+    `solution`) and returns:
+
+        {"status": "passed" | "failed" | "unavailable", "passed": int,
+         "failed": int, "errors": int, "tests": [{"name", "outcome",
+         "message", "duration_s"}], "summary": str, "output": str,
+         "duration_s": float}
+
+    "failed" covers failing or erroring tests, a crash, a timeout and code that
+    cannot be imported; "unavailable" means the run says nothing about the
+    code (no tests, or a module not installed here).
+    """
+    start = time.perf_counter()
+    with _slots, tempfile.TemporaryDirectory(prefix="sdlc-qa-") as workspace:
+        harness = _HARNESS.replace("{cpu_s}", str(TEST_CPU_S)).replace("{memory_bytes}",
+                                                                      str(TEST_MEMORY_MB * 1024 * 1024))
+        for name, source in (("solution.py", code), ("test_solution.py", tests), ("_harness.py", harness)):
+            with open(os.path.join(workspace, name), "w", encoding="utf-8") as f:
+                f.write(source)
+        report_path = os.path.join(workspace, "_report.json")
+        returncode, output = _run_process(workspace, report_path)
+        report = None
+        if os.path.exists(report_path):
+            with open(report_path, "r", encoding="utf-8") as f:
+                report = json.load(f)
+
+    tests_run = (report or {}).get("tests", [])
+    result = {
+        "passed": sum(1 for test in tests_run if test["outcome"] == PASSED),
+        "failed": sum(1 for test in tests_run if test["outcome"] == FAILED),
+        "errors": sum(1 for test in tests_run if test["outcome"] == "error"),
+        "tests": tests_run,
+        "output": output[-OUTPUT_TAIL_CHARS:],
+        "duration_s": round(time.perf_counter() - start, 3),
+    }
+    collection_error = (report or {}).get("collection_error")
+    if returncode is None:
+        result.update(status=FAILED, summary=f"Timed out after {TEST_TIMEOUT_S:g}s.")
+    elif report is None and returncode < 0:
+        result.update(status=FAILED, summary=f"Test process killed by signal {-returncode} "
+                                             f"(CPU limit {TEST_CPU_S}s, memory limit {TEST_MEMORY_MB} MB).")
+    elif report is None:
+        result.update(status=FAILED, summary=f"Test process exited with code {returncode} before finishing.")
+    elif collection_error and collection_error["type"] == "ModuleNotFoundError":
+        result.update(status=UNAVAILABLE, summary=collection_error["message"])
+    elif collection_error:
+        result.update(status=FAILED, summary=f"Could not import the code or tests: {collection_error['message']}")
+    elif not tests_run:
+        result.update(status=UNAVAILABLE, summary="No test functions found.")
+    elif result["failed"] or result["errors"]:
+        result.update(status=FAILED, summary=f"{result['passed']} passed, {result['failed']} failed, "
+                                             f"{result['errors']} errors.")
+    else:
+        result.update(status=PASSED, summary=f"{result['passed']} passed.")
+    return result
@@ -1,16 +1,18 @@
 import streamlit as st
-import os
 from typing import Literal
 from pydantic import BaseModel, Field
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.output_parsers import StrOutputParser
 from langgraph.graph import StateGraph, START, END
-from langchain_groq import ChatGroq
+from llm_backend import make_chat_model, require_api_key
+from llm_cache import enable_llm_cache
 
-os.environ["GROQ_API_KEY"] = st.secrets["GROQ_API_KEY"]
+require_api_key(secrets=st.secrets)
 
-# Initialize LLM
-llm = ChatGroq(model="qwen-2.5-32b")
+# Initialize LLM; at temperature 0 a repeated query gets the same answer, so it
+# is served from the shared response cache
+enable_llm_cache()
+llm = make_chat_model("qwen-2.5-32b", temperature=0)
 
 # Schema for structured output to use as routing logic
 class CustomerQueryRoute(BaseModel):
@@ -191,132 +193,133 @@ graph.add_edge("uncertain_response", END)
 customer_query_workflow = graph.compile()
 
 # 🎨 Streamlit UI - Frontend
-st.set_page_config(page_title="📞 Smart Customer Query Classifier", layout="wide")
-with st.sidebar:
-    st.subheader("Workflow Diagram")
-
-    # ✅ Generate Mermaid Workflow Diagram
-    mermaid_diagram = customer_query_workflow.get_graph().draw_mermaid_png()
-
-    # ✅ Save and Display the Image in Sidebar
-    image_path = "workflow_diagram.png"
-    with open(image_path, "wb") as f:
-        f.write(mermaid_diagram)
-
-    st.image(image_path, caption="Workflow Execution")
-
-# Define sample questions by category
-billing_samples = [
-    "I was charged twice for my monthly subscription",
-    "How do I update my credit card information?",
-    "When will my refund be processed?",
-    "I need a copy of my last invoice",
-    "Can I change my billing cycle from monthly to annual?"
-]
-
-tech_support_samples = [
-    "The app keeps crashing when I try to upload photos",
-    "I forgot my password and can't reset it",
-    "The dashboard isn't showing my latest data",
-    "I'm getting an error code XZ-404 when I try to login",
-    "How do I connect your software to my email account?"
-]
-
-sales_samples = [
-    "What's the difference between your Basic and Pro plans?",
-    "Do you offer discounts for educational institutions?",
-    "I want to upgrade my subscription to the enterprise level",
-    "Does your product support integration with Salesforce?",
-    "Can I get a demo of your new features?"
-]
-
-ambiguous_samples = [
-    "I need help with my account",
-    "I'm having problems with your product",
-    "Can someone please contact me as soon as possible?",
-    "What are the steps to set this up and how much does it cost?",
-    "I'm not sure if I'm in the right place"
-]
-
-# Sidebar with sample questions
-st.sidebar.title("📝 Sample Questions")
-st.sidebar.info("Click on any sample question to test the classifier")
-
-st.sidebar.subheader("💰 Billing Questions")
-for sample in billing_samples:
-    if st.sidebar.button(sample, key=f"billing_{billing_samples.index(sample)}"):
-        st.session_state.user_query = sample
-
-st.sidebar.subheader("🔧 Tech Support Questions")
-for sample in tech_support_samples:
-    if st.sidebar.button(sample, key=f"tech_{tech_support_samples.index(sample)}"):
-        st.session_state.user_query = sample
-
-st.sidebar.subheader("🛒 Sales Questions")
-for sample in sales_samples:
-    if st.sidebar.button(sample, key=f"sales_{sales_samples.index(sample)}"):
-        st.session_state.user_query = sample
-
-st.sidebar.subheader("❓ Ambiguous Questions")
-for sample in ambiguous_samples:
-    if st.sidebar.button(sample, key=f"ambig_{ambiguous_samples.index(sample)}"):
-        st.session_state.user_query = sample
-
-# Initialize session state for user query if it doesn't exist
-if 'user_query' not in st.session_state:
-    st.session_state.user_query = ""
-
-# Main content area
-st.title("📞 AI-Powered Customer Query Classifier")
-st.write("This system classifies customer queries into **Billing, Tech Support, or Sales** departments.")
-
-# 📍 User input field - show the selected sample or allow manual input
-user_query = st.text_area("📝 Enter your customer query:", value=st.session_state.user_query, height=100)
-
-# Clear button
-col1, col2 = st.columns([1, 5])
-with col1:
-    if st.button("🧹 Clear"):
+if __name__ == "__main__":
+    st.set_page_config(page_title="📞 Smart Customer Query Classifier", layout="wide")
+    with st.sidebar:
+        st.subheader("Workflow Diagram")
+
+        # ✅ Generate Mermaid Workflow Diagram
+        mermaid_diagram = customer_query_workflow.get_graph().draw_mermaid_png()
+
+        # ✅ Save and Display the Image in Sidebar
+        image_path = "workflow_diagram.png"
+        with open(image_path, "wb") as f:
+            f.write(mermaid_diagram)
+
+        st.image(image_path, caption="Workflow Execution")
+
+    # Define sample questions by category
+    billing_samples = [
+        "I was charged twice for my monthly subscription",
+        "How do I update my credit card information?",
+        "When will my refund be processed?",
+        "I need a copy of my last invoice",
+        "Can I change my billing cycle from monthly to annual?"
+    ]
+
+    tech_support_samples = [
+        "The app keeps crashing when I try to upload photos",
+        "I forgot my password and can't reset it",
+        "The dashboard isn't showing my latest data",
+        "I'm getting an error code XZ-404 when I try to login",
+        "How do I connect your software to my email account?"
+    ]
+
+    sales_samples = [
+        "What's the difference between your Basic and Pro plans?",
+        "Do you offer discounts for educational institutions?",
+        "I want to upgrade my subscription to the enterprise level",
+        "Does your product support integration with Salesforce?",
+        "Can I get a demo of your new features?"
+    ]
+
+    ambiguous_samples = [
+        "I need help with my account",
+        "I'm having problems with your product",
+        "Can someone please contact me as soon as possible?",
+        "What are the steps to set this up and how much does it cost?",
+        "I'm not sure if I'm in the right place"
+    ]
+
+    # Sidebar with sample questions
+    st.sidebar.title("📝 Sample Questions")
+    st.sidebar.info("Click on any sample question to test the classifier")
+
+    st.sidebar.subheader("💰 Billing Questions")
+    for sample in billing_samples:
+        if st.sidebar.button(sample, key=f"billing_{billing_samples.index(sample)}"):
+            st.session_state.user_query = sample
+
+    st.sidebar.subheader("🔧 Tech Support Questions")
+    for sample in tech_support_samples:
+        if st.sidebar.button(sample, key=f"tech_{tech_support_samples.index(sample)}"):
+            st.session_state.user_query = sample
+
+    st.sidebar.subheader("🛒 Sales Questions")
+    for sample in sales_samples:
+        if st.sidebar.button(sample, key=f"sales_{sales_samples.index(sample)}"):
+            st.session_state.user_query = sample
+
+    st.sidebar.subheader("❓ Ambiguous Questions")
+    for sample in ambiguous_samples:
+        if st.sidebar.button(sample, key=f"ambig_{ambiguous_samples.index(sample)}"):
+            st.session_state.user_query = sample
+
+    # Initialize session state for user query if it doesn't exist
+    if 'user_query' not in st.session_state:
         st.session_state.user_query = ""
-        user_query = ""
-        st.experimental_rerun()
-
-# 🔎 Query Classification Button
-if st.button("🔎 Classify Query") or (user_query != "" and user_query != st.session_state.get('last_processed_query', "")):
-    if not user_query:
-        st.warning("⚠️ Please enter a query before proceeding.")
-    else:
-        # Store the last processed query to prevent duplicate processing
-        st.session_state.last_processed_query = user_query
+
+    # Main content area
+    st.title("📞 AI-Powered Customer Query Classifier")
+    st.write("This system classifies customer queries into **Billing, Tech Support, or Sales** departments.")
+
+    # 📍 User input field - show the selected sample or allow manual input
+    user_query = st.text_area("📝 Enter your customer query:", value=st.session_state.user_query, height=100)
+
+    # Clear button
+    col1, col2 = st.columns([1, 5])
+    with col1:
+        if st.button("🧹 Clear"):
+            st.session_state.user_query = ""
+            user_query = ""
+            st.experimental_rerun()
+
+    # 🔎 Query Classification Button
+    if st.button("🔎 Classify Query") or (user_query != "" and user_query != st.session_state.get('last_processed_query', "")):
+        if not user_query:
+            st.warning("⚠️ Please enter a query before proceeding.")
+        else:
+            # Store the last processed query to prevent duplicate processing
+            st.session_state.last_processed_query = user_query
         
-        with st.spinner("🔄 Analyzing query..."):
-            # 🚀 Invoke LangGraph Workflow
-            state = customer_query_workflow.invoke({"input": user_query})
+            with st.spinner("🔄 Analyzing query..."):
+                # 🚀 Invoke LangGraph Workflow
+                state = customer_query_workflow.invoke({"input": user_query})
         
-        # Create two columns for response and classification details
-        response_col, info_col = st.columns([3, 1])
+            # Create two columns for response and classification details
+            response_col, info_col = st.columns([3, 1])
         
-        with response_col:
-            st.subheader("💬 Response:")
-            st.markdown(f"**{state['response']}**")
+            with response_col:
+                st.subheader("💬 Response:")
+                st.markdown(f"**{state['response']}**")
         
-        with info_col:
-            st.subheader("🏷️ Classification:")
+            with info_col:
+                st.subheader("🏷️ Classification:")
             
-            # Display department with appropriate emoji
-            dept_emoji = {"billing": "💰", "tech_support": "🔧", "sales": "🛒"}.get(state['department'], "❓")
-            st.markdown(f"**Department:** {dept_emoji} {state['department'].upper()}")
+                # Display department with appropriate emoji
+                dept_emoji = {"billing": "💰", "tech_support": "🔧", "sales": "🛒"}.get(state['department'], "❓")
+                st.markdown(f"**Department:** {dept_emoji} {state['department'].upper()}")
             
-            # Display confidence with color coding
-            confidence = state['confidence']
-            if confidence >= 0.8:
-                st.markdown(f"**Confidence:** 🟢 {confidence:.2f}")
-            elif confidence >= 0.7:
-                st.markdown(f"**Confidence:** 🟡 {confidence:.2f}")
-            else:
-                st.markdown(f"**Confidence:** 🔴 {confidence:.2f}")
+                # Display confidence with color coding
+                confidence = state['confidence']
+                if confidence >= 0.8:
+                    st.markdown(f"**Confidence:** 🟢 {confidence:.2f}")
+                elif confidence >= 0.7:
+                    st.markdown(f"**Confidence:** 🟡 {confidence:.2f}")
+                else:
+                    st.markdown(f"**Confidence:** 🔴 {confidence:.2f}")
             
-            st.markdown(f"**Reason:** {state['reason']}")
+                st.markdown(f"**Reason:** {state['reason']}")
 
-st.markdown("---")
-st.caption("Powered by **LangGraph-Routing Workflow** 🚀")
\ No newline at end of file
+    st.markdown("---")
+    st.caption("Powered by **LangGraph-Routing Workflow** 🚀")
\ No newline at end of file
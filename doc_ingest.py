@@ -0,0 +1,145 @@
+"""
+Cached text extraction for uploaded requirements documents.
+
+Extracted text is cached in memory, keyed by a hash of the uploaded bytes, so
+Streamlit reruns (e.g. every chat message) never re-parse an unchanged
+document. The cache is process-wide and bounded by the size of the text it
+holds; the least recently used documents are dropped first.
+"""
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import pypdf
+
+DEFAULT_MAX_CACHE_BYTES = int(os.getenv("INGEST_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+TEXT_MIME = "text/plain"
+PDF_MIME = "application/pdf"
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+EXTENSION_MIME_TYPES = {
+    ".txt": TEXT_MIME,
+    ".md": TEXT_MIME,
+    ".pdf": PDF_MIME,
+    ".docx": DOCX_MIME,
+}
+
+
+class UnsupportedDocumentError(ValueError):
+    pass
+
+
+class TextCache:
+    """
+    Thread-safe LRU of extracted text, bounded by total UTF-8 size in bytes.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: str, text: str) -> None:
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            self._entries[key] = (text, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+
+_text_cache = TextCache()
+
+
+def detect_mime_type(file_name: str = "", mime_type: str = "") -> str:
+    if mime_type in (TEXT_MIME, PDF_MIME, DOCX_MIME):
+        return mime_type
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension in EXTENSION_MIME_TYPES:
+        return EXTENSION_MIME_TYPES[extension]
+    raise UnsupportedDocumentError(f"Unsupported document type: {mime_type or file_name or 'unknown'}")
+
+
+def _extract_pdf(data: bytes) -> str:
+    # Pages are written one by one into a single buffer instead of growing a
+    # string with +=, which copies the whole document for every page.
+    reader = pypdf.PdfReader(io.BytesIO(data))
+    out = io.StringIO()
+    for page in reader.pages:
+        out.write(page.extract_text() or "")
+        out.write("\n")
+    return out.getvalue()
+
+
+def _extract_docx(data: bytes) -> str:
+    try:
+        import docx
+    except ImportError as e:
+        raise UnsupportedDocumentError("Reading .docx files requires python-docx (pip install python-docx)") from e
+
+    document = docx.Document(io.BytesIO(data))
+    out = io.StringIO()
+    for paragraph in document.paragraphs:
+        out.write(paragraph.text)
+        out.write("\n")
+    for table in document.tables:
+        for row in table.rows:
+            out.write(" | ".join(cell.text for cell in row.cells))
+            out.write("\n")
+    return out.getvalue()
+
+
+def extract_text(data: bytes, file_name: str = "", mime_type: str = "") -> str:
+    """
+    Return the text of a txt, pdf or docx document, served from the cache when
+    the same bytes were extracted before.
+    """
+    mime_type = detect_mime_type(file_name, mime_type)
+    key = hashlib.sha256(data).hexdigest()
+    text = _text_cache.get(key)
+    if text is not None:
+        return text
+
+    if mime_type == TEXT_MIME:
+        text = data.decode("utf-8")
+    elif mime_type == PDF_MIME:
+        text = _extract_pdf(data)
+    else:
+        text = _extract_docx(data)
+
+    _text_cache.put(key, text)
+    return text
+
+
+def load_uploaded_file(uploaded_file) -> str:
+    """
+    Extract the text of a Streamlit `UploadedFile`.
+    """
+    return extract_text(uploaded_file.getvalue(), uploaded_file.name, uploaded_file.type)
+
+
+def load_path(path: str) -> str:
+    """
+    Extract the text of a document on local disk.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    return extract_text(data, path)
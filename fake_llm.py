@@ -0,0 +1,195 @@
+"""
+Offline stand-in for the Groq chat models, for benchmarks and CI.
+
+`FakeChatModel` answers without any network access or API key. Plain prompts
+get deterministic filler text (seeded by the prompt) and structured-output
+calls (`with_structured_output`) get tool-call arguments generated from the
+requested schema, so CustomerQueryRoute, Feedback, Review, UserStories,
+DesignDocs and TestCases all parse. Latency is simulated as a fixed time to
+first token plus a token rate, which makes graph overhead measurable
+deterministically.
+
+Point the repo at it with LLM_BACKEND=fake (see llm_backend.py).
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Any, Iterator, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from chunking import CHARS_PER_TOKEN, estimate_tokens
+
+DEFAULT_LATENCY_S = float(os.getenv("FAKE_LLM_LATENCY_S", "0.0"))
+DEFAULT_TOKENS_PER_S = float(os.getenv("FAKE_LLM_TOKENS_PER_S", "0"))
+DEFAULT_RESPONSE_TOKENS = int(os.getenv("FAKE_LLM_RESPONSE_TOKENS", "64"))
+# Number of items generated for list fields (stories, cases, documents, ...)
+DEFAULT_LIST_ITEMS = int(os.getenv("FAKE_LLM_LIST_ITEMS", "3"))
+
+_WORDS = (
+    "system user request feature login account payment order report service "
+    "validate create update delete review approve design test deploy secure "
+    "data module interface response error flow step check result value"
+).split()
+
+
+def _seed(text: str) -> int:
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def _filler(seed: int, n_words: int) -> str:
+    return " ".join(_WORDS[(seed + i * 7) % len(_WORDS)] for i in range(max(1, n_words)))
+
+
+def _prompt_text(messages) -> str:
+    return "\n".join(str(message.content) for message in messages)
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Deterministic chat model with simulated latency.
+
+    `latency_s` is the time to first token; with `tokens_per_s` > 0 every
+    output token adds 1 / tokens_per_s on top. `field_overrides` forces values
+    of structured-output fields by name, e.g. {"status": "Not Approved"} to
+    exercise a review loop.
+    """
+
+    model: str = "fake"
+    latency_s: float = DEFAULT_LATENCY_S
+    tokens_per_s: float = DEFAULT_TOKENS_PER_S
+    response_tokens: int = DEFAULT_RESPONSE_TOKENS
+    list_items: int = DEFAULT_LIST_ITEMS
+    field_overrides: dict = {}
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model": self.model, "response_tokens": self.response_tokens}
+
+    def bind_tools(self, tools, *, tool_choice=None, **kwargs):
+        formatted_tools = [convert_to_openai_tool(tool) for tool in tools]
+        return super().bind(tools=formatted_tools, tool_choice=tool_choice, **kwargs)
+
+    # -------------------- Response content --------------------
+
+    def _fake_value(self, schema: dict, name: str, seed: int, defs: dict) -> Any:
+        if "$ref" in schema:
+            schema = defs.get(schema["$ref"].split("/")[-1], {})
+        if name in self.field_overrides:
+            return self.field_overrides[name]
+        if "const" in schema:
+            return schema["const"]
+        if "enum" in schema:
+            return schema["enum"][0]
+        for key in ("anyOf", "oneOf", "allOf"):
+            if key in schema:
+                options = [option for option in schema[key] if option.get("type") != "null"]
+                return self._fake_value(options[0] if options else {}, name, seed, defs)
+
+        schema_type = schema.get("type", "string")
+        if schema_type == "object":
+            return {
+                field: self._fake_value(field_schema, field, seed + i, defs)
+                for i, (field, field_schema) in enumerate(schema.get("properties", {}).items())
+            }
+        if schema_type == "array":
+            return [
+                self._fake_value(schema.get("items", {}), name, seed + i, defs)
+                for i in range(self.list_items)
+            ]
+        if schema_type == "number":
+            return 0.9
+        if schema_type == "integer":
+            return 1
+        if schema_type == "boolean":
+            return True
+        return f"{name}: {_filler(seed, 8)}"
+
+    def _tool_call(self, tools: list, tool_choice, seed: int) -> dict:
+        tool = tools[0]
+        choice_name = tool_choice.get("function", {}).get("name") if isinstance(tool_choice, dict) else tool_choice
+        for candidate in tools:
+            if candidate["function"]["name"] == choice_name:
+                tool = candidate
+        parameters = tool["function"].get("parameters", {})
+        return {
+            "name": tool["function"]["name"],
+            "args": self._fake_value(parameters, "", seed, parameters.get("$defs", {})),
+            "id": f"call_{seed:08x}",
+        }
+
+    def _fake_text(self, seed: int) -> str:
+        # Every line is a comment, so nodes that expect code still get valid Python
+        max_chars = self.response_tokens * CHARS_PER_TOKEN
+        words = _filler(seed, self.response_tokens)[:max_chars].rsplit(" ", 1)[0].split()
+        lines = [" ".join(words[i:i + 12]) for i in range(0, len(words), 12)]
+        return "\n".join(f"# {line}" for line in lines)
+
+    def _usage(self, prompt: str, completion: str) -> dict:
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(completion)
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+    def _response(self, messages, tools, tool_choice) -> tuple:
+        prompt = _prompt_text(messages)
+        seed = _seed(prompt)
+        if tools:
+            tool_call = self._tool_call(tools, tool_choice, seed)
+            completion = json.dumps(tool_call["args"])
+            return "", [tool_call], self._usage(prompt, completion)
+        content = self._fake_text(seed)
+        return content, [], self._usage(prompt, content)
+
+    def _sleep_for(self, output_tokens: int) -> None:
+        delay = self.latency_s
+        if self.tokens_per_s > 0:
+            delay += output_tokens / self.tokens_per_s
+        if delay > 0:
+            time.sleep(delay)
+
+    # -------------------- BaseChatModel hooks --------------------
+
+    def _generate(self, messages, stop: Optional[list] = None, run_manager=None,
+                  tools: Optional[list] = None, tool_choice=None, **kwargs) -> ChatResult:
+        content, tool_calls, usage = self._response(messages, tools, tool_choice)
+        self._sleep_for(usage["output_tokens"])
+        message = AIMessage(content=content, tool_calls=tool_calls, usage_metadata=usage,
+                            response_metadata={"model_name": self.model})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop: Optional[list] = None, run_manager=None,
+                tools: Optional[list] = None, tool_choice=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        content, tool_calls, usage = self._response(messages, tools, tool_choice)
+        if self.latency_s > 0:
+            time.sleep(self.latency_s)
+        if tool_calls:
+            chunk = AIMessageChunk(content="", usage_metadata=usage, tool_call_chunks=[
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": 0}
+                for call in tool_calls
+            ])
+            yield ChatGenerationChunk(message=chunk)
+            return
+
+        pieces = content.split(" ")
+        for i, piece in enumerate(pieces):
+            text = piece if i == len(pieces) - 1 else piece + " "
+            if self.tokens_per_s > 0:
+                time.sleep(estimate_tokens(text) / self.tokens_per_s)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text))
+            if run_manager:
+                run_manager.on_llm_new_token(text, chunk=chunk)
+            yield chunk
+        # Usage arrives with the last chunk, as it does from the real providers
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=usage))
@@ -0,0 +1,128 @@
+"""
+Chat model factory shared by every workflow in this repo.
+
+The backend is chosen by the LLM_BACKEND environment variable:
+
+    groq  (default)  ChatGroq, needs GROQ_API_KEY
+    fake             fake_llm.FakeChatModel, offline with simulated latency
+    record           ChatGroq, every call also appended to the LLM_CASSETTE file
+    replay           answers from the LLM_CASSETTE file, offline; LLM_REPLAY_LATENCY
+                     is "original" (default) or "zero"
+
+so the Streamlit apps, agent.py and the benchmarks can all run without keys:
+
+    LLM_BACKEND=fake FAKE_LLM_LATENCY_S=0.2 streamlit run tcgeneration.py
+
+`get_chat_model` keeps one client per model and settings for the whole
+process, and `get_configurable` / `get_run_llm` read the dependencies that
+the compiled graphs (agent.py, sdlc_workflow.py) take from their run config.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+GROQ_BACKEND = "groq"
+FAKE_BACKEND = "fake"
+RECORD_BACKEND = "record"
+REPLAY_BACKEND = "replay"
+# Backends that never reach a provider and so need no API key
+OFFLINE_BACKENDS = (FAKE_BACKEND, REPLAY_BACKEND)
+
+
+def get_backend() -> str:
+    # Read on every call so benchmarks can switch backends after import
+    return os.getenv("LLM_BACKEND", GROQ_BACKEND).strip().lower()
+
+
+def using_fake_llm() -> bool:
+    """
+    True when the configured backend is offline (fake or replay).
+    """
+    return get_backend() in OFFLINE_BACKENDS
+
+
+def require_api_key(name: str = "GROQ_API_KEY", secrets=None):
+    """
+    Puts the provider key `name` into the environment, from `secrets` (e.g.
+    st.secrets) when given. Offline backends need no key, so this is a no-op there.
+    """
+    if using_fake_llm():
+        return
+    if secrets is not None:
+        os.environ[name] = secrets[name]
+    elif not os.getenv(name):
+        raise RuntimeError(f"{name} is not set; add it to the environment or .env")
+
+
+def make_chat_model(model: str, **kwargs):
+    """
+    Returns a chat model for `model` from the configured backend. Extra keyword
+    arguments (temperature, ...) are passed to ChatGroq and ignored offline.
+    """
+    backend = get_backend()
+    if backend == FAKE_BACKEND:
+        from fake_llm import FakeChatModel
+        # Fake answers cost nothing, and caching them would hide the simulated latency
+        return FakeChatModel(model=model, cache=False)
+    if backend in (RECORD_BACKEND, REPLAY_BACKEND):
+        from llm_cassette import CassetteChatModel, get_cassette
+        cassette = get_cassette(os.getenv("LLM_CASSETTE", "llm_cassette.jsonl"))
+        latency = os.getenv("LLM_REPLAY_LATENCY", "original").strip().lower()
+        if latency not in ("original", "zero"):
+            raise ValueError(f"LLM_REPLAY_LATENCY must be 'original' or 'zero', got '{latency}'")
+        # Uncached, so every call is recorded and replayed with its own latency
+        if backend == RECORD_BACKEND:
+            from langchain_groq import ChatGroq
+            inner = ChatGroq(model=model, **kwargs)
+            return CassetteChatModel(model=model, cassette=cassette, mode=backend, inner=inner, cache=False)
+        return CassetteChatModel(model=model, cassette=cassette, mode=backend, latency=latency, cache=False)
+    if backend == GROQ_BACKEND:
+        from langchain_groq import ChatGroq
+        return ChatGroq(model=model, **kwargs)
+    raise ValueError(f"Unknown LLM_BACKEND '{backend}', expected one of "
+                     f"{', '.join((GROQ_BACKEND, FAKE_BACKEND, RECORD_BACKEND, REPLAY_BACKEND))}")
+
+
+# Streamlit reruns the page script on every interaction, but this module is
+# imported once per process, so every rerun and session shares these clients
+# (and the HTTP connection pools inside them).
+# Shared clients, least recently used first. Only for settings fixed by the
+# deployment: a client for a user-entered API key belongs to that user's session.
+MAX_SHARED_CLIENTS = int(os.getenv("LLM_MAX_SHARED_CLIENTS", "16"))
+_clients_lock = threading.Lock()
+_clients = OrderedDict()
+
+
+def get_chat_model(model: str, **kwargs):
+    """
+    Returns the shared make_chat_model(model, **kwargs) client, creating it on first use.
+    """
+    if "api_key" in kwargs:
+        raise ValueError("get_chat_model does not share clients for an api_key; use make_chat_model")
+    key = (get_backend(), model, tuple(sorted(kwargs.items())))
+    with _clients_lock:
+        llm = _clients.get(key)
+        if llm is None:
+            llm = make_chat_model(model, **kwargs)
+            _clients[key] = llm
+            if len(_clients) > MAX_SHARED_CLIENTS:
+                _clients.popitem(last=False)
+            print(f"Using model: {model}")
+        else:
+            _clients.move_to_end(key)
+    return llm
+
+
+def get_configurable(config: Optional[dict], key: str, default=None):
+    return (config or {}).get("configurable", {}).get(key, default)
+
+
+def get_run_llm(config: Optional[dict]):
+    """
+    The LLM a graph node was given in its run config.
+    """
+    llm = get_configurable(config, "llm")
+    if llm is None:
+        raise RuntimeError("No LLM in the run config. Pass the config from the workflow's build_run_config(llm, ...).")
+    return llm
@@ -0,0 +1,205 @@
+"""
+Shared, persistent response cache for every LangChain model in this repo.
+
+The cache plugs into LangChain's global LLM cache, so every `ChatGroq.invoke`
+(plain, chained or with structured output) in a process that called
+`enable_llm_cache()` can be served from it: agent.py, customerquery.py and
+the SDLC workflow (sdlc_workflow.py, streamlit_app.py).
+
+Only models sampling at temperature 0 are cached, which is how those
+modules build theirs. At the default temperature the same prompt is expected
+to give a different answer every time, which is why the pitch, PR statement
+and optimizer apps do not enable the cache at all.
+
+Entries live in one SQLite file in WAL mode, so several Streamlit processes
+and batch workers can share it. They are keyed by the model and its
+parameters (LangChain's llm_string) plus the exact prompt, expire after a
+TTL and are evicted least-recently-used beyond a size cap.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from langchain_core.caches import BaseCache
+from langchain_core.globals import get_llm_cache, set_llm_cache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+DEFAULT_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".llm_cache.sqlite")
+DEFAULT_TTL_S = float(os.getenv("LLM_CACHE_TTL_S", str(7 * 24 * 3600)))
+DEFAULT_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+# Expiry and size eviction run every this many writes rather than on each one
+EVICT_EVERY_WRITES = 50
+
+# Matches the constructor kwargs (JSON) and the call parameters (Python repr) in an llm_string
+_TEMPERATURE_RE = re.compile(r"""["']temperature["'][:,]\s*([-+0-9.eE]+)""")
+# ChatGroq sends temperature 0 as 1e-08
+_ZERO_TEMPERATURE = 1e-6
+
+
+def is_deterministic(llm_string: str) -> bool:
+    """
+    True when the model in `llm_string` samples at temperature 0. A model with
+    no explicit temperature uses its provider default and is not cached.
+    """
+    temperatures = _TEMPERATURE_RE.findall(llm_string)
+    # Call parameters come after the constructor kwargs and override them
+    return bool(temperatures) and abs(float(temperatures[-1])) <= _ZERO_TEMPERATURE
+
+
+def _serialize(generations) -> str:
+    items = []
+    for generation in generations:
+        if isinstance(generation, ChatGeneration):
+            items.append({"type": "chat", "message": message_to_dict(generation.message)})
+        else:
+            items.append({"type": "text", "text": generation.text})
+    return json.dumps(items)
+
+
+def _deserialize(payload: str) -> list:
+    generations = []
+    for item in json.loads(payload):
+        if item["type"] == "chat":
+            generations.append(ChatGeneration(message=messages_from_dict([item["message"]])[0]))
+        else:
+            generations.append(Generation(text=item["text"]))
+    return generations
+
+
+class SQLiteResponseCache(BaseCache):
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_s: float = DEFAULT_TTL_S,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, llm_string TEXT NOT NULL, response TEXT NOT NULL,"
+            " created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        conn.execute("INSERT OR IGNORE INTO stats (name, value) VALUES ('hits', 0), ('misses', 0)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            if name == "hits":
+                self._hits += 1
+            else:
+                self._misses += 1
+        self._connection().execute("UPDATE stats SET value = value + 1 WHERE name = ?", (name,))
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[list]:
+        if not is_deterministic(llm_string):
+            return None
+        conn = self._connection()
+        key = self.make_key(prompt, llm_string)
+        row = conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+        now = time.time()
+        if row is None or now - row[1] > self.ttl_s:
+            self._count("misses")
+            return None
+        conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        self._count("hits")
+        return _deserialize(row[0])
+
+    def update(self, prompt: str, llm_string: str, return_val) -> None:
+        if not is_deterministic(llm_string):
+            return
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, llm_string, response, created_at, last_access)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (self.make_key(prompt, llm_string), llm_string, _serialize(return_val), now, now),
+        )
+        with self._lock:
+            self._writes += 1
+            evict = self._writes % EVICT_EVERY_WRITES == 0
+        if evict:
+            self.evict()
+
+    def evict(self) -> None:
+        """
+        Drops expired entries, then the least recently used ones beyond `max_entries`.
+        """
+        conn = self._connection()
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_s,))
+        conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            " SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def clear(self, **kwargs) -> None:
+        self._connection().execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        """
+        Hit/miss counts for this process and across every process sharing the file.
+        """
+        totals = dict(self._connection().execute("SELECT name, value FROM stats").fetchall())
+        entries = self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        with self._lock:
+            hits, misses = self._hits, self._misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "total_hits": totals.get("hits", 0),
+            "total_misses": totals.get("misses", 0),
+            "entries": entries,
+        }
+
+
+_enable_lock = threading.Lock()
+
+
+def enable_llm_cache(path: str = DEFAULT_CACHE_PATH) -> Optional[SQLiteResponseCache]:
+    """
+    Installs the shared cache as LangChain's global LLM cache (once per process).
+    Set LLM_CACHE_DISABLED=1 to opt out.
+    """
+    if os.getenv("LLM_CACHE_DISABLED", "").lower() in ("1", "true", "yes"):
+        return None
+    with _enable_lock:
+        cache = get_llm_cache()
+        if not isinstance(cache, SQLiteResponseCache):
+            cache = SQLiteResponseCache(path)
+            set_llm_cache(cache)
+        return cache
+
+
+def get_cache_stats() -> dict:
+    cache = get_llm_cache()
+    if not isinstance(cache, SQLiteResponseCache):
+        return {}
+    return cache.stats()
@@ -0,0 +1,175 @@
+"""
+Record/replay of LLM interactions ("cassettes") for reproducible performance runs.
+
+In record mode `CassetteChatModel` wraps a real model and appends every call
+to a JSONL cassette: the request fingerprint, the request messages, the
+response and the observed latency. In replay mode it answers from the
+cassette without a provider, sleeping for the recorded latency or not at
+all, so a slow production run (e.g. the streamlit_app SDLC loop) can be
+reproduced and profiled offline.
+
+    LLM_BACKEND=record LLM_CASSETTE=sdlc.jsonl streamlit run streamlit_app.py
+    LLM_BACKEND=replay LLM_CASSETTE=sdlc.jsonl LLM_REPLAY_LATENCY=zero python benchmarks/bench_workflows.py --workflows sdlc
+
+Identical requests made several times (review loops) are replayed in the
+order they were recorded; once a fingerprint's recordings are used up its
+last response is repeated.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+DEFAULT_CASSETTE_PATH = os.getenv("LLM_CASSETTE", "llm_cassette.jsonl")
+RECORD_MODE = "record"
+REPLAY_MODE = "replay"
+ORIGINAL_LATENCY = "original"
+ZERO_LATENCY = "zero"
+
+
+class CassetteMissError(LookupError):
+    pass
+
+
+def _tool_names(tools) -> list:
+    # Providers format tools differently, so requests are matched on tool names only
+    names = []
+    for tool in tools or []:
+        if isinstance(tool, dict) and "function" in tool:
+            names.append(tool["function"].get("name", ""))
+        else:
+            names.append(convert_to_openai_tool(tool)["function"]["name"])
+    return names
+
+
+def fingerprint(model: str, messages, tools=None) -> str:
+    """
+    Stable hash of a request: model, message roles and content, and the names
+    of any bound tools.
+    """
+    request = {
+        "model": model,
+        "messages": [[message.type, str(message.content)] for message in messages],
+        "tools": _tool_names(tools),
+    }
+    return hashlib.sha256(json.dumps(request, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """
+    One JSONL cassette file; thread-safe appends while recording, per-fingerprint
+    queues of recorded responses while replaying.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._responses = defaultdict(deque)
+        self._last = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._responses[entry["fingerprint"]].append(entry)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(entries) for entries in self._responses.values())
+
+    def append(self, entry: dict) -> None:
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def next_entry(self, request_fingerprint: str) -> dict:
+        with self._lock:
+            queue = self._responses.get(request_fingerprint)
+            if queue:
+                self._last[request_fingerprint] = queue.popleft()
+            entry = self._last.get(request_fingerprint)
+        if entry is None:
+            raise CassetteMissError(
+                f"No recorded response for request {request_fingerprint[:12]} in {self.path}; "
+                "record the run again with LLM_BACKEND=record."
+            )
+        return entry
+
+
+_cassettes_lock = threading.Lock()
+_cassettes = {}
+
+
+def get_cassette(path: str = DEFAULT_CASSETTE_PATH) -> Cassette:
+    """
+    Returns the process-wide Cassette for `path`, so every model records into one file.
+    """
+    path = os.path.abspath(path)
+    with _cassettes_lock:
+        if path not in _cassettes:
+            _cassettes[path] = Cassette(path)
+        return _cassettes[path]
+
+
+class CassetteChatModel(BaseChatModel):
+    """
+    Records calls to `inner` into `cassette` (mode "record") or answers from it
+    (mode "replay", no `inner` needed). `latency` is "original" or "zero".
+    """
+
+    model: str
+    cassette: Cassette
+    mode: str = REPLAY_MODE
+    latency: str = ORIGINAL_LATENCY
+    inner: Optional[BaseChatModel] = None
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    @property
+    def _llm_type(self) -> str:
+        return f"cassette-{self.mode}"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model": self.model, "cassette": self.cassette.path}
+
+    def bind_tools(self, tools, *, tool_choice=None, **kwargs):
+        if self.inner is not None:
+            # Let the real model format tools and tool_choice the way its API expects
+            bound = self.inner.bind_tools(tools, tool_choice=tool_choice, **kwargs)
+            return super().bind(**bound.kwargs)
+        formatted_tools = [convert_to_openai_tool(tool) for tool in tools]
+        return super().bind(tools=formatted_tools, tool_choice=tool_choice, **kwargs)
+
+    def _generate(self, messages, stop: Optional[list] = None, run_manager=None, **kwargs) -> ChatResult:
+        request_fingerprint = fingerprint(self.model, messages, kwargs.get("tools"))
+        if self.mode == RECORD_MODE:
+            return self._record(request_fingerprint, messages, stop, run_manager, **kwargs)
+
+        entry = self.cassette.next_entry(request_fingerprint)
+        if self.latency == ORIGINAL_LATENCY:
+            time.sleep(entry["latency_s"])
+        generations = [ChatGeneration(message=message) for message in messages_from_dict(entry["response"])]
+        return ChatResult(generations=generations)
+
+    def _record(self, request_fingerprint: str, messages, stop, run_manager, **kwargs) -> ChatResult:
+        start = time.perf_counter()
+        result = self.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        latency_s = time.perf_counter() - start
+        self.cassette.append({
+            "fingerprint": request_fingerprint,
+            "model": self.model,
+            "request": [message_to_dict(message) for message in messages],
+            "response": [message_to_dict(generation.message) for generation in result.generations],
+            "latency_s": round(latency_s, 6),
+            "recorded_at": time.time(),
+        })
+        return result
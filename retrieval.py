@@ -0,0 +1,91 @@
+"""
+Retrieval of the requirements sections relevant to a user request.
+
+Each document is split into small chunks and embedded into a FAISS index
+once; indexes are cached in memory by content hash, so later requests over
+the same document only pay for one query embedding and a similarity search.
+Documents small enough to send whole skip retrieval entirely.
+
+FAISS and the HuggingFace embeddings are optional (faiss-cpu,
+langchain_community and langchain_huggingface from requirements.txt); when
+they are not installed the full document is used, as before.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from chunking import estimate_tokens, split_into_chunks
+
+EMBEDDING_MODEL = os.getenv("RETRIEVAL_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+RETRIEVAL_MIN_TOKENS = int(os.getenv("RETRIEVAL_MIN_TOKENS", "2000"))
+RETRIEVAL_CHUNK_TOKENS = int(os.getenv("RETRIEVAL_CHUNK_TOKENS", "300"))
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "6"))
+MAX_CACHED_INDEXES = int(os.getenv("RETRIEVAL_MAX_CACHED_INDEXES", "16"))
+
+_lock = threading.Lock()
+_build_lock = threading.Lock()
+_default_embeddings = None
+_indexes = OrderedDict()
+
+
+def _get_default_embeddings():
+    global _default_embeddings
+    with _lock:
+        if _default_embeddings is None:
+            from langchain_huggingface import HuggingFaceEmbeddings
+            _default_embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+        return _default_embeddings
+
+
+def _index_key(content: str, embeddings) -> str:
+    embeddings_name = getattr(embeddings, "model_name", type(embeddings).__name__)
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return f"{embeddings_name}:{digest}"
+
+
+def get_index(content: str, embeddings=None):
+    """
+    Returns the FAISS index for `content`, building and caching it on first use.
+    """
+    from langchain_community.vectorstores import FAISS
+
+    embeddings = embeddings or _get_default_embeddings()
+    key = _index_key(content, embeddings)
+    with _lock:
+        if key in _indexes:
+            _indexes.move_to_end(key)
+            return _indexes[key]
+
+    # Embedding is CPU bound; building one index at a time also stops two
+    # requests for the same new document from embedding it twice.
+    with _build_lock:
+        with _lock:
+            if key in _indexes:
+                return _indexes[key]
+        chunks = split_into_chunks(content, RETRIEVAL_CHUNK_TOKENS)
+        index = FAISS.from_texts(chunks, embeddings, metadatas=[{"position": i} for i in range(len(chunks))])
+        with _lock:
+            _indexes[key] = index
+            while len(_indexes) > MAX_CACHED_INDEXES:
+                _indexes.popitem(last=False)
+    return index
+
+
+def retrieve_relevant_sections(content: str, query: str, k: int = RETRIEVAL_TOP_K, embeddings=None) -> str:
+    """
+    Returns the `k` chunks of `content` most similar to `query`, in document
+    order, or the whole `content` when it is small or retrieval is unavailable.
+    """
+    if estimate_tokens(content) <= RETRIEVAL_MIN_TOKENS:
+        return content
+    try:
+        index = get_index(content, embeddings)
+    except ImportError as e:
+        print(f"YHK: retrieval unavailable, using the full document: {e}")
+        return content
+
+    sections = index.similarity_search(query, k=k)
+    # Keep the original order so the prompt still reads like the document
+    sections.sort(key=lambda section: section.metadata["position"])
+    return "\n\n".join(section.page_content for section in sections)
@@ -0,0 +1,106 @@
+"""
+Run-level budgets for the SDLC workflow's review loops.
+
+A `RunBudget` caps four things for one workflow invocation:
+
+- fix iterations per review loop (user stories, design, code and security
+  review, test cases, QA);
+- total wall-clock time since the run started;
+- total LLM tokens (prompt + completion), counted from provider usage
+  metadata through the LangChain callback it doubles as;
+- consecutive no-op fixes per loop, i.e. fixes that returned the artifact
+  unchanged, so a loop that makes no progress stops early.
+
+The graph's decision functions ask it whether a budget is exhausted and, if
+so, route to a graceful exit that keeps the latest artifacts and reports
+which budget was hit.
+"""
+import os
+import threading
+import time
+from typing import Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+DEFAULT_MAX_LOOP_ITERATIONS = int(os.getenv("SDLC_MAX_LOOP_ITERATIONS", "3"))
+DEFAULT_DEADLINE_S = float(os.getenv("SDLC_DEADLINE_S", "900"))
+DEFAULT_MAX_TOKENS = int(os.getenv("SDLC_MAX_TOKENS", "200000"))
+DEFAULT_MAX_NOOP_FIXES = int(os.getenv("SDLC_MAX_NOOP_FIXES", "2"))
+
+ITERATIONS_BUDGET = "iterations"
+DEADLINE_BUDGET = "deadline"
+TOKENS_BUDGET = "tokens"
+NO_PROGRESS_BUDGET = "no_progress"
+
+
+class RunBudget(BaseCallbackHandler):
+    """
+    `loop_caps` overrides `max_loop_iterations` for individual loops, e.g.
+    {"qa": 1}. A cap, deadline, token or no-op fix limit of 0 or less disables it.
+    """
+
+    def __init__(self, max_loop_iterations: int = DEFAULT_MAX_LOOP_ITERATIONS,
+                 deadline_s: float = DEFAULT_DEADLINE_S, max_tokens: int = DEFAULT_MAX_TOKENS,
+                 loop_caps: Optional[dict] = None, max_noop_fixes: int = DEFAULT_MAX_NOOP_FIXES):
+        self.max_loop_iterations = max_loop_iterations
+        self.deadline_s = deadline_s
+        self.max_tokens = max_tokens
+        self.max_noop_fixes = max_noop_fixes
+        self.loop_caps = loop_caps or {}
+        self.started = time.monotonic()
+        self.tokens_used = 0
+        # Set by the decision that stopped the run, read by the exit node
+        self.hit = None
+        self._lock = threading.Lock()
+
+    def on_llm_end(self, response, **kwargs) -> None:
+        tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                tokens += usage.get("total_tokens", 0)
+        if not tokens:
+            tokens = ((response.llm_output or {}).get("token_usage") or {}).get("total_tokens", 0)
+        with self._lock:
+            self.tokens_used += tokens
+
+    def elapsed_s(self) -> float:
+        return time.monotonic() - self.started
+
+    def loop_cap(self, loop: str) -> int:
+        return self.loop_caps.get(loop, self.max_loop_iterations)
+
+    def exhausted(self, loop: str = "", iterations: int = 0, noop_fixes: int = 0) -> Optional[dict]:
+        """
+        Returns {"budget", "loop", "message"} for the first exhausted budget, or
+        None. The loop cap and no-op fix limit are only checked when `loop` is given.
+        """
+        if self.deadline_s > 0 and self.elapsed_s() >= self.deadline_s:
+            return {
+                "budget": DEADLINE_BUDGET,
+                "loop": loop,
+                "message": f"Wall-clock deadline of {self.deadline_s:g}s reached after {self.elapsed_s():.1f}s.",
+            }
+        with self._lock:
+            tokens_used = self.tokens_used
+        if self.max_tokens > 0 and tokens_used >= self.max_tokens:
+            return {
+                "budget": TOKENS_BUDGET,
+                "loop": loop,
+                "message": f"Token budget of {self.max_tokens} exhausted ({tokens_used} tokens used).",
+            }
+        if loop and self.max_noop_fixes > 0 and noop_fixes >= self.max_noop_fixes:
+            return {
+                "budget": NO_PROGRESS_BUDGET,
+                "loop": loop,
+                "message": f"The {loop.replace('_', ' ')} loop made no progress: the last {noop_fixes} "
+                           f"fixes returned it unchanged.",
+            }
+        cap = self.loop_cap(loop) if loop else 0
+        if cap > 0 and iterations >= cap:
+            return {
+                "budget": ITERATIONS_BUDGET,
+                "loop": loop,
+                "message": f"The {loop.replace('_', ' ')} loop reached its cap of {cap} fix iterations.",
+            }
+        return None
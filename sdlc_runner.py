@@ -0,0 +1,120 @@
+"""
+Background execution of SDLC runs.
+
+`start_run` submits a run to a process-wide worker pool and returns at once;
+the graph's nodes send their output as ui_events.UIEvent objects to the run's
+event log. Any number of Streamlit sessions (or reruns of one session) can follow
+a run by polling `RunHandle.events_since` with their own cursor, so the page
+is never blocked on `graph.invoke` and a rerun does not interrupt the run.
+
+At most SDLC_MAX_CONCURRENT_RUNS runs execute at once; further runs wait in
+the pool's queue with status "queued".
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from run_budget import RunBudget
+from sdlc_workflow import build_run_config, get_sdlc_app
+from ui_events import FINISHED, UIEvent
+
+MAX_CONCURRENT_RUNS = int(os.getenv("SDLC_MAX_CONCURRENT_RUNS", "4"))
+# Finished runs kept for late viewers; older ones are dropped first
+MAX_FINISHED_RUNS = 50
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+BUDGET_EXHAUSTED = "budget_exhausted"
+FAILED = "failed"
+
+
+class RunHandle:
+    """
+    One background run: its status, events so far and, once finished, the
+    final state or the error.
+    """
+
+    def __init__(self, run_id: str, budget: RunBudget):
+        self.run_id = run_id
+        self.budget = budget
+        self.status = QUEUED
+        self.final_state = None
+        self.error = None
+        self.future = None
+        # Append-only, so every viewer reads all events in order with its own cursor
+        self._events = []
+        self._changed = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in (COMPLETED, BUDGET_EXHAUSTED, FAILED)
+
+    def emit(self, event: UIEvent):
+        with self._changed:
+            self._events.append(event)
+            self._changed.notify_all()
+
+    def events_since(self, cursor: int, timeout: float = 0.0) -> list:
+        """
+        Events after the first `cursor` ones, waiting up to `timeout` seconds
+        for a new one when there are none yet.
+        """
+        with self._changed:
+            if len(self._events) <= cursor and timeout > 0:
+                self._changed.wait_for(lambda: len(self._events) > cursor, timeout)
+            return self._events[cursor:]
+
+
+_executor = ThreadPoolExecutor(max_workers=max(1, MAX_CONCURRENT_RUNS), thread_name_prefix="sdlc-run")
+_runs_lock = threading.Lock()
+_runs = {}
+
+
+def _execute(handle: RunHandle, inputs, config: dict):
+    handle.status = RUNNING
+    # The deadline covers execution, not the time spent waiting for a worker
+    handle.budget.started = time.monotonic()
+    try:
+        final_state = get_sdlc_app().invoke(inputs, config=config)
+        handle.final_state = final_state
+        handle.status = BUDGET_EXHAUSTED if final_state.get("budget_exhausted") else COMPLETED
+    except Exception as e:
+        print(f"YHK: run {handle.run_id} failed: {e}")
+        handle.error = e
+        handle.status = FAILED
+    finally:
+        handle.emit(UIEvent(handle.run_id, FINISHED, body=handle.status))
+
+
+def start_run(run_id: str, inputs, llm, budget: Optional[RunBudget] = None) -> RunHandle:
+    """
+    Starts `run_id` in the background with `inputs`, or resumes its checkpoint
+    when `inputs` is None, and returns its handle. A run that is already queued
+    or running is not started twice.
+    """
+    with _runs_lock:
+        handle = _runs.get(run_id)
+        if handle is not None and not handle.done:
+            return handle
+        handle = RunHandle(run_id, budget or RunBudget())
+        config = build_run_config(llm, run_id=run_id, budget=handle.budget, events=handle.emit)
+        _runs[run_id] = handle
+        finished = [other for other in _runs.values() if other.done]
+        for other in finished[:max(0, len(finished) - MAX_FINISHED_RUNS)]:
+            del _runs[other.run_id]
+    handle.future = _executor.submit(_execute, handle, inputs, config)
+    return handle
+
+
+def get_run(run_id: str) -> Optional[RunHandle]:
+    with _runs_lock:
+        return _runs.get(run_id)
+
+
+def active_runs() -> list:
+    """IDs of the runs queued or running in this process."""
+    with _runs_lock:
+        return [run_id for run_id, handle in _runs.items() if not handle.done]
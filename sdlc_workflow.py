@@ -0,0 +1,1274 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Annotated, Dict, List, Literal, Optional
+
+from typing_extensions import TypedDict
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langchain_core.prompts import PromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import RunnableConfig
+from pydantic import BaseModel, Field
+
+from chunking import estimate_tokens
+from code_sandbox import EXECUTE_TESTS, PASSED, UNAVAILABLE, extract_python, is_python, run_tests
+from code_patch import PatchError, apply_edit_response, parse_edit_blocks
+from llm_backend import get_chat_model, get_configurable, get_run_llm, make_chat_model
+from llm_cache import enable_llm_cache
+from run_budget import RunBudget
+from static_checks import QUALITY, SECURITY, analyze, blocking, format_findings
+from ui_events import RunUI, discard_event, in_streamlit_script
+
+#############################################################################
+# 1. State and structured-output schemas
+#############################################################################
+def _merge_memo(memo: dict, update: dict) -> dict:
+    return {**(memo or {}), **(update or {})}
+
+def _merge_parts(parts: dict, update: Optional[dict]) -> dict:
+    # None clears the parts once they were merged, so every fan-out starts empty
+    return {} if update is None else {**(parts or {}), **update}
+
+class State(TypedDict):
+    user_requirements: str
+    user_stories: List[str]
+    design_docs: Dict[List[str],List[str]]
+    code: str
+    test_cases: List[str]
+    feedback:str
+    status:str
+    # Written by the parallel code and security reviews (or by the static analysis
+    # when it rejects the code), merged into status/feedback
+    code_review: Dict[str, str]
+    security_review: Dict[str, str]
+    # Advisory static analysis findings per category ("quality", "security") for the LLM reviewers
+    static_notes: Dict[str, str]
+    # Result of executing the generated tests (code_sandbox.run_tests), None when QA was LLM-judged
+    qa_results: Optional[dict]
+    # Fix iterations per review loop, and which budget stopped the run (if any)
+    loop_iterations: Dict[str, int]
+    budget_exhausted: Dict[str, str]
+    # Verdicts keyed by "<reviewer>:<artifact hash>", merged so parallel reviewers can both write
+    review_memo: Annotated[Dict[str, dict], _merge_memo]
+    # Consecutive fixes per loop that returned the artifact unchanged
+    noop_fixes: Dict[str, int]
+    # Per-story output of the parallel design / test case nodes, keyed by story index
+    design_parts: Annotated[Dict[str, dict], _merge_parts]
+    test_case_parts: Annotated[Dict[str, dict], _merge_parts]
+
+class UserStories(BaseModel):
+    stories: List[str]
+
+class DesignDocs(BaseModel):
+    functional:List[str]=Field(
+        description="Functional Documents",
+    )
+    technical:List[str]=Field(
+        description="Technical Documents",
+    )
+class TestCases(BaseModel):
+    cases:List[str]
+
+class Review(BaseModel):
+    review: str = Field(
+        description="Detailed feedback that provides specific, actionable insights about strengths and weaknesses. Should include concrete suggestions for improvement with clear reasoning behind each point. For code reviews, include comments on quality, readability, performance, and adherence to best practices. For design documents, address completeness, clarity, and technical feasibility."
+    )
+    status: Literal["Approved", "Not Approved"]
+
+#############################################################################
+# 2. Prompts, built once per process
+#############################################################################
+USERSTORIES_PROMPT = PromptTemplate(
+template="""You are an expert agile product manager with expertise in user story creation.
+
+                    Task: Based on the following requirement: "{user_requirements}", generate exactly 5 well-structured user stories.
+
+                    Each user story must:
+                    - Follow the format: As a <specific user type>, I want to <specific action/feature> so that <clear benefit>
+                    - Be concise yet descriptive
+                    - Focus on user value, not implementation details
+                    - Be testable with clear acceptance criteria
+                    - Be independent of each other (no dependencies between stories)
+                    - Cover different aspects of the application functionality
+
+                    Your user stories should address the core functionality described in the requirements while considering different user perspectives.
+                    """,
+    input_variables=["user_requirements"]
+)
+
+PO_REVIEW_PROMPT = PromptTemplate(
+template="""You are a senior product owner with 10+ years of experience reviewing user stories.
+
+                    Task: Review the following user stories based on INVEST criteria (Independent, Negotiable, Valuable, Estimable, Small, Testable):
+
+                    {user_stories}
+
+                    Provide a comprehensive evaluation addressing:
+                    1. Clarity and structure of each story
+                    2. Whether each story provides clear user value
+                    3. Whether stories collectively cover the main functionality needed
+                    4. Whether acceptance criteria are implied or need clarification
+                    5. Suggestions for improvements where needed
+
+                    Respond in the following format:
+                    - Status: Approved / Not Approved
+                    - Feedback: [Detailed evaluation with specific recommendations for improvement]
+                    """,
+    input_variables=["user_stories"]
+)
+
+REVISE_USERSTORIES_PROMPT = PromptTemplate(
+    template="""You are an expert in generating user stories. The Product Owner has provided feedback.
+
+            Below is the feedback:
+            {feedback_summary}
+
+            These are the previously generated user stories:
+            {old_stories_context}
+
+            Based on this feedback, regenerate exactly 5 user stories that incorporate these improvements.
+            Format:
+            As a <user>, I want to <action> so that <benefit>.""",
+    input_variables=["feedback_summary", "old_stories_context"]
+)
+
+DESIGN_DOCS_PROMPT = PromptTemplate(
+template="""You are a senior software architect with expertise in both functional and technical specifications.
+
+        Task: Based on the provided user stories, create comprehensive design documents that will guide the implementation.
+
+        User Stories:
+        {user_stories}
+
+        Provide comprehensive but clear and concise documentation that would enable a developer to build the system without further clarification.
+        """,
+    input_variables=["user_stories"]
+)
+
+STORY_DESIGN_DOCS_PROMPT = PromptTemplate(
+template="""You are a senior software architect with expertise in both functional and technical specifications.
+
+        Task: Write the functional and technical design sections for ONE user story of a larger system.
+        The other user stories are designed separately; they are listed only for context, so do not
+        repeat their sections.
+
+        User Story to design:
+        {user_story}
+
+        All User Stories:
+        {user_stories}
+
+        Provide clear and concise sections specific to this story that would enable a developer to build it without further clarification.
+        """,
+    input_variables=["user_story", "user_stories"]
+)
+
+DESIGN_REVIEW_PROMPT = PromptTemplate(
+   template="""You are a senior technical architect reviewing functional and technical design documents.
+            Below is the design documentation:
+            {design_docs}
+
+            Respond in the following format:
+            - Status: Approved / Not Approved
+            - Feedback: Provide feedback on Design Docs
+
+            """,
+    input_variables=["design_docs"]
+)
+
+REVISE_DESIGN_DOCS_PROMPT = PromptTemplate(
+    template="""You are a senior technical architect correcting docs based on feedback.
+            The following feedback was provided after deisgn review:
+
+           {design_review_feedback}
+
+           these are old docs
+
+           {old_docs}
+
+            **Update the design documents to address the issues while maintaining clarity and structure. **""",
+    input_variables=["design_review_feedback","old_docs"]
+)
+
+CODE_PROMPT = PromptTemplate(
+template="""You are an expert software developer with deep knowledge of modern programming practices, patterns, and best practices.
+
+        Task: Generate production-ready, fully functional code based on the provided design documents:
+
+        {design_documents}
+
+        Your code should:
+        1. Follow clean code principles (readability, maintainability, SOLID principles)
+        2. Include proper error handling and edge cases
+        3. Be secure against common vulnerabilities
+        4. Be optimized for performance where appropriate
+        5. Include comments for complex logic
+        6. Follow standard naming conventions and code organization
+        7. Be modular and well-structured
+        8. Include all necessary imports and dependencies
+
+
+        Choose the most appropriate language and framework based on the requirements. Implement all functionality described in the design documents, ensuring that business logic is correctly reflected in the code.
+
+        Return only the code with proper indentation, no explanations.
+        """,
+    input_variables=["design_documents"]
+)
+
+CODE_REVIEW_PROMPT = PromptTemplate(
+    template="""You are a senior software engineer conducting a code review.
+            Analyze the following code and provide feedback with Approved/Not Approved
+            {generated_code}
+
+            Static analysis notes (advisory; they may be false positives, confirm before acting on them):
+            {static_notes}
+           """,
+    input_variables=["generated_code", "static_notes"]
+)
+
+FIX_CODE_PROMPT = PromptTemplate(
+    template="""You are an expert software engineer and cybersecurity expert responsible for fixing code issues.
+            The following code was reviewed, and feedback was provided:
+
+            **Original Code:**
+            {generated_code}
+
+            **Code Review Feedback:**
+            {code_review_feedback}
+
+            **Security Review Feedback:**
+            {security_review_feedback}
+
+            Fix the code to address all issues, including security vulnerabilities, performance optimizations,
+            and best practices. Return only the corrected code, with proper indentation and structure,
+            and without any explanations.""",
+    input_variables=["generated_code", "code_review_feedback", "security_review_feedback"]
+)
+
+SECURITY_REVIEW_PROMPT = PromptTemplate(
+    template="""You are a senior cybersecurity expert specializing in secure coding practices and vulnerability assessment.
+
+            Task: Conduct a thorough security review of the following code:
+
+            **Code:**
+            {generated_code}
+
+            **Static analysis notes** (advisory; they may be false positives, confirm before acting on them):
+            {static_notes}
+
+            Provide structured feedback, including detected issues and suggested fixes.
+            Format:
+            - Status: Approved / Needs Fixes
+            - Feedback: (Explain security risks and provide recommended changes)
+
+            """,
+    input_variables=["generated_code", "static_notes"]
+)
+
+TEST_CASES_PROMPT = PromptTemplate(
+    template="""You are a senior QA engineer with expertise in comprehensive test coverage and test-driven development.
+
+            Task: Create a comprehensive test suite for the following code and design specifications:
+
+            **Code:**
+            {generated_code}
+
+            **Functional Design Document:**
+            {functional_design}
+
+            **Technical Design Document:**
+            {technical_design}
+
+            Generate a structured list of **unit tests, integration tests, and edge cases**.
+            Use the following format:
+
+            - **Test Case Name:** <Descriptive Name>
+            - **Description:** <What the test validates>
+            - **Test Steps:** <Step-by-step execution>
+            - **Expected Result:** <Expected output>
+
+           """,
+    input_variables=["generated_code", "functional_design", "technical_design"]
+)
+
+STORY_TEST_CASES_PROMPT = PromptTemplate(
+    template="""You are a senior QA engineer with expertise in comprehensive test coverage and test-driven development.
+
+            Task: Create the test cases that verify ONE user story of the following code. The other user
+            stories are covered separately, so only test what this story needs.
+
+            **User Story:**
+            {user_story}
+
+            **Code:**
+            {generated_code}
+
+            **Functional Design Document:**
+            {functional_design}
+
+            **Technical Design Document:**
+            {technical_design}
+
+            Generate a structured list of **unit tests, integration tests, and edge cases** for this story.
+            Use the following format:
+
+            - **Test Case Name:** <Descriptive Name>
+            - **Description:** <What the test validates>
+            - **Test Steps:** <Step-by-step execution>
+            - **Expected Result:** <Expected output>
+
+           """,
+    input_variables=["user_story", "generated_code", "functional_design", "technical_design"]
+)
+
+TEST_CASE_REVIEW_PROMPT = PromptTemplate(
+    template="""You are a senior test strategy expert reviewing the following test cases:
+
+            **testcases:**
+            {testcases}
+
+            Provide structured feedback
+            Format:
+            - Status: Approved / Needs Fixes
+            - Feedback: (Explain improvements)
+
+            """,
+    input_variables=["testcases"]
+)
+
+FIX_TEST_CASES_PROMPT = PromptTemplate(
+    template="""You are a Test case review expert fixing test cases.
+            The following test cases was reviewed, and feedback is provided:
+
+            **Original test cases:**
+            {testcases}
+
+            **testcases Review Feedback:**
+            {feedback}
+
+            Fix all issues
+
+            Return only the corected test cases.
+            Do not include explanations.""",
+    input_variables=["testcases", "feedback"]
+)
+
+QA_PROMPT = PromptTemplate(
+    template="""You are a seasoned QA engineer with expertise in thorough testing and quality validation.
+
+            Task: Perform a comprehensive QA evaluation of the following code and test cases:
+            Perform QA testing on code {code} with test cases {testcases}
+            provide status(Approved/Not Approved) and feedback
+            and provide test case execution/results in feed back
+            """,
+    input_variables=["code","testcases"]
+)
+
+QA_TESTS_PROMPT = PromptTemplate(
+    template="""You are a senior QA engineer turning test cases into executable Python tests.
+
+            The code below is saved as the module `solution`:
+
+            **Code:**
+            {code}
+
+            **testcases:**
+            {testcases}
+
+            Write one test function per test case that can be checked without a network, database or server.
+            Each function must be named test_<something>, take no arguments and check results with plain
+            assert statements. Import what you need with `from solution import ...`; use only the Python
+            standard library otherwise (no pytest fixtures, no mocks of external services).
+            Return only the Python code, without explanations.""",
+    input_variables=["code", "testcases"]
+)
+
+FIX_QA_PROMPT = PromptTemplate(
+    template="""You are an expert software engineer responsible for fixing code based on QA Feedback.
+            The following is code,test cases and QA testing feedback:
+
+            **Original Code:**
+            {code}
+
+            **testcases:**
+            {testcases}
+
+            ** qa feedback**
+            {qa_feedback}
+
+            Fix the code to address all issues
+            Return only the corrected code, with proper indentation and structure,
+            and without any explanations.""",
+    input_variables=["code", "testcases","qa_feedback"]
+)
+
+# Used by both code-fix nodes before falling back to the full-rewrite prompts above
+PATCH_CODE_PROMPT = PromptTemplate(
+    template="""{role}
+            The following code was reviewed, and feedback was provided:
+
+            **Current Code:**
+            {code}
+
+            **{feedback_title}:**
+            {feedback}
+
+            Fix the code to address all issues. Do not rewrite the whole program: reply only with
+            SEARCH/REPLACE edit blocks, one per change, in exactly this format:
+
+<<<<<<< SEARCH
+(lines copied exactly from the current code, including indentation)
+=======
+(the lines that replace them)
+>>>>>>> REPLACE
+
+            Every SEARCH section must match exactly one place in the current code. Keep the
+            blocks small and do not include explanations.""",
+    input_variables=["role", "code", "feedback_title", "feedback"]
+)
+
+#############################################################################
+# 3. Runtime dependencies, injected through the run config
+#############################################################################
+# The compiled graph is shared by every session, so nodes take the LLM and where
+# to send their UI output from config["configurable"], never from globals. Nodes
+# never call Streamlit themselves (see ui_events.py), so the graph can run on a
+# background worker (sdlc_runner.py) and in parallel branches.
+# Design documents and test cases are generated per user story in parallel
+# (one LLM call each) and merged in story order, unless turned off
+FAN_OUT_PER_STORY = os.getenv("SDLC_FAN_OUT_PER_STORY", "1") != "0"
+
+def build_run_config(llm, tabs=None, run_id: str = "", budget: Optional[RunBudget] = None,
+                     events=None, fan_out: Optional[bool] = None) -> dict:
+    """
+    Run config for the compiled SDLC graph. `events` is a callable that receives
+    every ui_events.UIEvent the nodes emit (e.g. a queue's put). Without it the
+    events are rendered in place when called from a Streamlit script: into
+    `tabs`, which maps tab names ("Overview", "User Stories", "Design Docs",
+    "Code", "Security", "Testing", "QA") to Streamlit containers, or into plain
+    containers. Outside Streamlit (benchmarks, scripts) they are discarded.
+    `run_id` names the checkpointed run; a new one is generated when omitted.
+    `budget` defaults to a RunBudget with the SDLC_MAX_LOOP_ITERATIONS /
+    SDLC_DEADLINE_S / SDLC_MAX_TOKENS settings. `fan_out` turns the per-story
+    design docs and test cases on or off (default: SDLC_FAN_OUT_PER_STORY).
+    """
+    budget = budget or RunBudget()
+    if events is None and not in_streamlit_script():
+        events = discard_event
+    return {
+        "configurable": {"llm": llm, "tabs": tabs, "thread_id": run_id or new_run_id(), "budget": budget,
+                         "events": events, "fan_out": FAN_OUT_PER_STORY if fan_out is None else fan_out},
+        # The budget also counts the tokens of every LLM call in the run
+        "callbacks": [budget],
+    }
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+def _count_iteration(state: State, loop: str) -> Dict[str, int]:
+    iterations = dict(state.get("loop_iterations") or {})
+    iterations[loop] = iterations.get(loop, 0) + 1
+    return iterations
+
+def _ui(config: Optional[RunnableConfig]) -> RunUI:
+    """Where the calling node's output goes: the run's event sink, or rendered in place."""
+    node = (config or {}).get("metadata", {}).get("langgraph_node", "")
+    return RunUI(get_configurable(config, "thread_id", ""), node, get_configurable(config, "events"),
+                 get_configurable(config, "tabs"))
+
+# Chains are built once per (LLM, prompt, output) and reused by every run. The
+# LLM object is kept in the entry so its id cannot be reused while cached.
+# Per-session clients add entries too, so the least recently used are dropped.
+MAX_CACHED_CHAINS = int(os.getenv("SDLC_MAX_CACHED_CHAINS", "256"))
+_chains_lock = threading.Lock()
+_chains = OrderedDict()
+
+def _chain(config: Optional[RunnableConfig], prompt: PromptTemplate, schema=None, parse_text: bool = False):
+    llm = get_run_llm(config)
+    key = (id(llm), id(prompt), schema, parse_text)
+    with _chains_lock:
+        entry = _chains.get(key)
+        if entry is None:
+            if schema is not None:
+                chain = prompt | llm.with_structured_output(schema)
+            elif parse_text:
+                chain = prompt | llm | StrOutputParser()
+            else:
+                chain = prompt | llm
+            entry = (llm, chain)
+            _chains[key] = entry
+            if len(_chains) > MAX_CACHED_CHAINS:
+                _chains.popitem(last=False)
+        else:
+            _chains.move_to_end(key)
+    return entry[1]
+
+# Code below this size is cheaper to regenerate than to patch
+CODE_PATCH_MIN_TOKENS = int(os.getenv("SDLC_CODE_PATCH_MIN_TOKENS", "300"))
+
+def _revise_code(config: Optional[RunnableConfig], code: str, role: str, feedback_title: str, feedback: str,
+                 regenerate, escalate: bool = False) -> str:
+    """
+    Asks the LLM for SEARCH/REPLACE edits to `code` and applies them locally.
+    Falls back to `regenerate()`, the full-rewrite chain, when the code is small,
+    the edits do not apply cleanly, or `escalate` is set because the last
+    patch changed nothing.
+    """
+    if escalate or CODE_PATCH_MIN_TOKENS <= 0 or estimate_tokens(code) < CODE_PATCH_MIN_TOKENS:
+        return regenerate()
+    response = _chain(config, PATCH_CODE_PROMPT, parse_text=True).invoke({
+        "role": role,
+        "code": code,
+        "feedback_title": feedback_title,
+        "feedback": feedback,
+    })
+    try:
+        patched = apply_edit_response(code, response)
+    except PatchError as e:
+        print(f"YHK: code patch rejected ({e}), regenerating the full code")
+        return regenerate()
+    print(f"YHK: applied {len(parse_edit_blocks(response))} edit block(s) to the code")
+    return patched
+
+# A review of an artifact that did not change since the same reviewer last saw it
+# would most likely repeat its verdict, so the verdict is reused instead.
+def _artifact_hash(*artifacts) -> str:
+    serialized = json.dumps(artifacts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()[:16]
+
+def _memoized_review(state: State, reviewer: str, artifacts: tuple, review) -> tuple:
+    """
+    Returns (verdict, memo update): the stored verdict when `reviewer` already
+    judged these exact `artifacts`, otherwise `review()`, the verdict dict of a
+    new LLM review, together with the entry to store for it.
+    """
+    key = f"{reviewer}:{_artifact_hash(*artifacts)}"
+    verdict = (state.get("review_memo") or {}).get(key)
+    if verdict is not None:
+        print(f"YHK: {reviewer} already reviewed this version, reusing its verdict")
+        return verdict, {}
+    verdict = review()
+    return verdict, {key: verdict}
+
+NOOP_FIX_NOTE = ("Your previous fix returned it unchanged, so the feedback above still applies in full. "
+                 "Make concrete changes that address every point.")
+
+def _noop_streak(state: State, loop: str) -> int:
+    return (state.get("noop_fixes") or {}).get(loop, 0)
+
+def _escalated(state: State, loop: str, feedback: str) -> str:
+    """Adds a firmer instruction to `feedback` when the loop's last fix was a no-op."""
+    return f"{feedback}\n\n{NOOP_FIX_NOTE}" if _noop_streak(state, loop) else feedback
+
+def _count_noop(state: State, loop: str, before, after) -> Dict[str, int]:
+    noop_fixes = dict(state.get("noop_fixes") or {})
+    if _artifact_hash(before) == _artifact_hash(after):
+        noop_fixes[loop] = noop_fixes.get(loop, 0) + 1
+        print(f"YHK: the {loop} fix returned the artifact unchanged ({noop_fixes[loop]} in a row)")
+    else:
+        noop_fixes[loop] = 0
+    return noop_fixes
+
+#############################################################################
+# 4. Workflow nodes
+#############################################################################
+def user_inputs_requirements(state: State):
+    return state
+
+def auto_generate_user_stories(state: State, config: RunnableConfig):
+    if not state["user_requirements"]:
+        _ui(config).error("Overview", "Please enter requirements before generating user stories.")
+        return state
+
+    ui = _ui(config)
+    ui.progress("🔄 Generating User Stories...")
+    userstory_chain = _chain(config, USERSTORIES_PROMPT, UserStories)
+    response = userstory_chain.invoke({"user_requirements": state["user_requirements"]})
+    state["user_stories"] = response.stories
+
+    ui.subheader("User Stories", "Generated User Stories")
+    for story in state["user_stories"]:
+        ui.write("User Stories", f"- {story}")
+
+    return state
+
+def product_owner_review(state: State, config: RunnableConfig):
+    ui = _ui(config)
+    ui.progress("🔄 Product Owner Review in Progress...")
+    review_chain = _chain(config, PO_REVIEW_PROMPT, Review)
+    verdict, memo = _memoized_review(state, "product_owner", (state["user_stories"],), lambda: _verdict(
+        review_chain.invoke({"user_stories": "\n".join(state["user_stories"])})))
+    state['status']=verdict["status"]
+    state['feedback']=verdict["feedback"]
+    state['review_memo'] = memo
+
+    ui.write("User Stories", f'Product Owner Approval status')
+    ui.write("User Stories", f"**Status:** {state['status']}")
+    ui.write("User Stories", f"**Feedback:** {state['feedback']}")
+    return state
+
+def _verdict(response: Review) -> dict:
+    return {"status": response.status, "feedback": response.review}
+
+def decision(state):
+    """Returns the next step based on status and feedback."""
+    if state['status']=="Approved":
+        return "Approved"
+    else:
+        return "Feedback"
+
+def revise_user_stories(state: State, config: RunnableConfig):
+    ui = _ui(config)
+    ui.progress("🔄 Revising User Stories...")
+    feedback_summary = state["feedback"]
+    old_stories_context = "\n".join(state["user_stories"])
+
+    regeneration_chain = _chain(config, REVISE_USERSTORIES_PROMPT, UserStories)
+    response = regeneration_chain.invoke({
+        "feedback_summary": _escalated(state, "user_stories", feedback_summary),
+        "old_stories_context": old_stories_context
+    })
+
+    state['noop_fixes'] = _count_noop(state, "user_stories", state['user_stories'], response.stories)
+    state['user_stories']= response.stories
+    state['loop_iterations'] = _count_iteration(state, "user_stories")
+
+    ui.subheader("User Stories", "Revised User stories after Product Owner Review")
+    for story in state["user_stories"]:
+        ui.write("User Stories", f"- {story}")
+    return state
+
+def create_design_documents(state: State, config: RunnableConfig):
+    """Generates functional & technical design docs based on user stories."""
+    ui = _ui(config)
+    ui.progress("🔄 Creating Design Documents...")
+    chain = _chain(config, DESIGN_DOCS_PROMPT, DesignDocs)
+    response = chain.invoke({"user_stories": "\n".join(state["user_stories"])})
+
+    _show_design_docs(ui, response.functional, response.technical)
+    return {
+        "design_docs": {
+            "functional": response.functional,
+            "technical": response.technical
+        }
+    }
+
+def _show_design_docs(ui: RunUI, functional: List[str], technical: List[str]):
+    ui.subheader("Design Docs", "Design Docs")
+    ui.write("Design Docs", f"**Functional documents:**")
+    for doc in functional:
+        ui.write("Design Docs", f"- {doc}")
+    ui.write("Design Docs", f"**Technical documents:**")
+    for doc in technical:
+        ui.write("Design Docs", f"- {doc}")
+
+def _merged_parts(parts: dict, field: str) -> List[str]:
+    """`field` of every story's part in story order, each identical entry kept once."""
+    return list(dict.fromkeys(item for index in sorted(parts, key=int) for item in parts[index].get(field, [])))
+
+def design_documents_for_story(story: dict, config: RunnableConfig):
+    """
+    Generates the design docs for one user story; runs once per story in
+    parallel and shows nothing, "Merge Design Documents" does.
+    """
+    chain = _chain(config, STORY_DESIGN_DOCS_PROMPT, DesignDocs)
+    response = chain.invoke({"user_story": story["user_story"], "user_stories": "\n".join(story["user_stories"])})
+    return {"design_parts": {str(story["story_index"]): {"functional": response.functional,
+                                                         "technical": response.technical}}}
+
+def merge_design_documents(state: State, config: RunnableConfig):
+    """Joins the per-story design docs in user story order."""
+    parts = state.get("design_parts") or {}
+    ui = _ui(config)
+    ui.progress(f"✅ Design Documents created for {len(parts)} user stories")
+    functional, technical = _merged_parts(parts, "functional"), _merged_parts(parts, "technical")
+    _show_design_docs(ui, functional, technical)
+    return {"design_docs": {"functional": functional, "technical": technical}, "design_parts": None}
+
+def design_review(state: State, config: RunnableConfig):
+    ui = _ui(config)
+    ui.progress("🔄 Design Review in Progress...")
+    review_chain = _chain(config, DESIGN_REVIEW_PROMPT, Review)
+    verdict, memo = _memoized_review(state, "design", (state["design_docs"],), lambda: _verdict(
+        review_chain.invoke({
+            "design_docs": state["design_docs"]
+        })))
+    state['status']=verdict["status"]
+    state['feedback']=verdict["feedback"]
+    state['review_memo'] = memo
+
+    ui.write("Design Docs", f'Design Review')
+    ui.write("Design Docs", f"**Status:** {state['status']}")
+    ui.write("Design Docs", f"**Feedback:** {state['feedback']}")
+    return state
+
+def revise_design_docs(state: State, config: RunnableConfig):
+    """Revises design documents based on code review feedback."""
+    ui = _ui(config)
+    ui.progress("🔄 Revising Design Documents...")
+    revision_chain = _chain(config, REVISE_DESIGN_DOCS_PROMPT, DesignDocs)
+    response = revision_chain.invoke({'design_review_feedback':_escalated(state, "design", state['feedback']),"old_docs":state["design_docs"]})
+    revised_docs = {
+        "functional": response.functional,
+        "technical": response.technical
+    }
+
+    ui.subheader("Design Docs", "Revised Design Docs")
+    ui.write("Design Docs", f"**Functional documents:** {response.functional}")
+    ui.write("Design Docs", f"**Technical documents:** {response.technical}")
+    return {
+        "design_docs": revised_docs,
+        "loop_iterations": _count_iteration(state, "design"),
+        "noop_fixes": _count_noop(state, "design", state["design_docs"], revised_docs),
+    }
+
+def generate_code(state: State, config: RunnableConfig):
+    """Generates executable code based on design documents."""
+    ui = _ui(config)
+    ui.progress("🔄 Generating Code...")
+    code_chain = _chain(config, CODE_PROMPT, parse_text=True)
+    state['code'] = code_chain.invoke({"design_documents":state['design_docs']})
+
+    ui.subheader("Code", "Generated Code")
+    ui.code("Code", state['code'])
+    return state
+
+def _merged_feedback(code: dict, security: dict) -> str:
+    feedback = []
+    if code["status"] != "Approved":
+        feedback.append(f"**Code Review Feedback:**\n{code['feedback']}")
+    if security["status"] != "Approved":
+        feedback.append(f"**Security Review Feedback:**\n{security['feedback']}")
+    return "\n\n".join(feedback)
+
+def static_analysis(state: State, config: RunnableConfig):
+    """
+    Runs local checks on the code. Syntax errors and hard-coded secrets send it
+    straight back for fixes; other findings go to the LLM reviewers as notes.
+    """
+    findings = analyze(state["code"])
+    if findings is None:
+        print("YHK: code is not Python, skipping static analysis")
+    if not findings or not blocking(findings):
+        notes = {category: format_findings([finding for finding in findings or [] if finding["category"] == category])
+                 for category in (QUALITY, SECURITY)}
+        if findings:
+            print(f"YHK: static analysis found {len(findings)} advisory issue(s), passing them to the reviewers")
+        return {"status": "Approved", "feedback": "", "static_notes": notes}
+
+    print(f"YHK: static analysis found {len(blocking(findings))} blocking issue(s), skipping the LLM reviews")
+    reviews = {}
+    for category, key in ((QUALITY, "code_review"), (SECURITY, "security_review")):
+        category_findings = [finding for finding in findings if finding["category"] == category]
+        reviews[key] = {
+            "status": "Not Approved" if category_findings else "Approved",
+            "feedback": f"Static analysis:\n{format_findings(category_findings)}" if category_findings else "No issues.",
+        }
+    ui = _ui(config)
+    ui.progress("🔄 Static Analysis found issues, sending the code back for fixes")
+    for tab, key in (("Code", "code_review"), ("Security", "security_review")):
+        if reviews[key]["status"] != "Approved":
+            ui.subheader(tab, "Static Analysis")
+            ui.write(tab, f"**Status:** {reviews[key]['status']}")
+            ui.markdown(tab, reviews[key]["feedback"])
+    return dict(reviews, status="Not Approved",
+                feedback=_merged_feedback(reviews["code_review"], reviews["security_review"]))
+
+def _static_notes(state: State, category: str) -> str:
+    return (state.get("static_notes") or {}).get(category) or "None."
+
+# Code and security review run as parallel branches that only return their
+# verdicts; "Merge Reviews" shows both.
+def code_review(state: State, config: RunnableConfig):
+    """Reviews generated code based on design documents and provides feedback."""
+    review_chain = _chain(config, CODE_REVIEW_PROMPT, Review)
+    verdict, memo = _memoized_review(state, "code", (state["code"],), lambda: _verdict(
+        review_chain.invoke({"generated_code": state['code'], "static_notes": _static_notes(state, QUALITY)})))
+    return {"code_review": verdict, "review_memo": memo}
+
+def security_review(state: State, config: RunnableConfig):
+    """Conducts a security review of the code to check for vulnerabilities."""
+    security_chain = _chain(config, SECURITY_REVIEW_PROMPT, Review)
+    verdict, memo = _memoized_review(state, "security", (state["code"],), lambda: _verdict(
+        security_chain.invoke({
+            "generated_code": state["code"],
+            "static_notes": _static_notes(state, SECURITY)
+        })))
+    return {"security_review": verdict, "review_memo": memo}
+
+def merge_reviews(state: State, config: RunnableConfig):
+    """Combines the code and security reviews into one verdict for a single fix pass."""
+    code, security = state["code_review"], state["security_review"]
+    ui = _ui(config)
+    ui.progress("🔄 Code and Security Review completed")
+    ui.write("Code", "Code Review status")
+    ui.write("Code", f'**Status:** {code["status"]}')
+    ui.write("Code", f'**Feedback:** {code["feedback"]}')
+
+    ui.subheader("Security", "Security Review")
+    ui.write("Security", f'**Status:** {security["status"]}')
+    ui.write("Security", f'**Feedback:** {security["feedback"]}')
+
+    approved = code["status"] == "Approved" and security["status"] == "Approved"
+    return {"status": "Approved" if approved else "Not Approved", "feedback": _merged_feedback(code, security)}
+
+def fix_code_after_reviews(state: State, config: RunnableConfig):
+    """Fixes code based on the code review and security review (or static analysis) feedback in one pass."""
+    ui = _ui(config)
+    ui.progress("🔄 Fixing Code After Code and Security Review...")
+    code, security = state["code_review"], state["security_review"]
+    # An approving reviewer has nothing to fix
+    code_feedback = code["feedback"] if code["status"] != "Approved" else "No issues."
+    security_feedback = security["feedback"] if security["status"] != "Approved" else "No issues."
+    fix_chain = _chain(config, FIX_CODE_PROMPT, parse_text=True)
+    fixed_code = _revise_code(
+        config, state["code"],
+        "You are an expert software engineer and cybersecurity expert responsible for fixing code issues.",
+        "Review Feedback", _escalated(state, "code_review", state["feedback"]),
+        lambda: fix_chain.invoke({
+            "generated_code": state["code"],
+            "code_review_feedback": _escalated(state, "code_review", code_feedback),
+            "security_review_feedback": security_feedback
+        }),
+        escalate=_noop_streak(state, "code_review") > 0)
+
+    state["noop_fixes"] = _count_noop(state, "code_review", state["code"], fixed_code)
+    state["code"] = fixed_code
+    state["loop_iterations"] = _count_iteration(state, "code_review")
+
+    ui.subheader("Code", "Fixed Code After Code and Security Review")
+    ui.code("Code", state['code'])
+
+    if security["status"] != "Approved":
+        ui.subheader("Security", "Fixed Code After Security Review")
+        ui.code("Security", state['code'])
+    return state
+
+def write_test_cases(state: State, config: RunnableConfig):
+    """Generates test cases for the code based on functional and technical design documents."""
+    ui = _ui(config)
+    ui.progress("🔄 Writing Test Cases...")
+    test_case_chain = _chain(config, TEST_CASES_PROMPT, TestCases)
+    test_cases = test_case_chain.invoke({
+        "generated_code": state["code"],
+        "functional_design": state["design_docs"].get("functional", "No functional design available."),
+        "technical_design": state["design_docs"].get("technical", "No technical design available.")
+    })
+
+    state["test_cases"] = test_cases.cases
+
+    _show_test_cases(ui, state["test_cases"])
+    return state
+
+def _show_test_cases(ui: RunUI, cases: List[str]):
+    ui.subheader("Testing", "Test Cases")
+    for i, case in enumerate(cases):
+        ui.markdown("Testing", f"**Test Case {i+1}:**")
+        ui.markdown("Testing", case)
+        ui.divider("Testing")
+
+def test_cases_for_story(story: dict, config: RunnableConfig):
+    """
+    Generates the test cases for one user story; runs once per story in
+    parallel and shows nothing, "Merge Test Cases" does.
+    """
+    chain = _chain(config, STORY_TEST_CASES_PROMPT, TestCases)
+    test_cases = chain.invoke({
+        "user_story": story["user_story"],
+        "generated_code": story["code"],
+        "functional_design": story["design_docs"].get("functional", "No functional design available."),
+        "technical_design": story["design_docs"].get("technical", "No technical design available.")
+    })
+    return {"test_case_parts": {str(story["story_index"]): {"cases": test_cases.cases}}}
+
+def merge_test_cases(state: State, config: RunnableConfig):
+    """Joins the per-story test cases in user story order."""
+    parts = state.get("test_case_parts") or {}
+    ui = _ui(config)
+    ui.progress(f"✅ Test Cases written for {len(parts)} user stories")
+    cases = _merged_parts(parts, "cases")
+    _show_test_cases(ui, cases)
+    return {"test_cases": cases, "test_case_parts": None}
+
+def test_case_review(state, config: RunnableConfig):
+    """Conducts a Testcase review of test cases."""
+    ui = _ui(config)
+    ui.progress("🔄 Test Case Review in Progress...")
+    chain = _chain(config, TEST_CASE_REVIEW_PROMPT, Review)
+    verdict, memo = _memoized_review(state, "test_cases", (state["test_cases"],), lambda: _verdict(
+        chain.invoke({
+            "testcases": state["test_cases"]
+        })))
+    state['status']=verdict["status"]
+    state['feedback']=verdict["feedback"]
+    state['review_memo'] = memo
+
+    ui.subheader("Testing", "Test Cases Review")
+    ui.write("Testing", f'**Status:** {state["status"]}')
+    ui.write("Testing", f'**Feedback:** {state["feedback"]}')
+    return state
+
+def fix_testcases_after_review(state, config: RunnableConfig):
+    """Fixes testcases based on review feedback """
+    ui = _ui(config)
+    ui.progress("🔄 Fixing Test Cases...")
+    chain = _chain(config, FIX_TEST_CASES_PROMPT, TestCases)
+    fixed_testcases = chain.invoke({
+        "testcases": state["test_cases"],
+        "feedback": _escalated(state, "test_cases", state["feedback"])
+    })
+
+    state["noop_fixes"] = _count_noop(state, "test_cases", state["test_cases"], fixed_testcases.cases)
+    state["test_cases"] = fixed_testcases.cases
+    state["loop_iterations"] = _count_iteration(state, "test_cases")
+
+    ui.subheader("Testing", "Revised Test Cases")
+    for i, case in enumerate(state['test_cases']):
+        ui.markdown("Testing", f"**Test Case {i+1}:**")
+        ui.markdown("Testing", case)
+        ui.divider("Testing")
+    return state
+
+def _execute_tests(state, config: RunnableConfig) -> Optional[dict]:
+    """
+    Has the LLM write the test cases as Python test functions and runs them
+    against the code in the sandbox. Returns None when the code is not Python
+    or the tests cannot run here, so QA falls back to an LLM review.
+    """
+    if not EXECUTE_TESTS:
+        return None
+    code = extract_python(state["code"])
+    if not code.strip() or not is_python(code):
+        print("YHK: generated code is not Python, QA falls back to an LLM review")
+        return None
+    tests_chain = _chain(config, QA_TESTS_PROMPT, parse_text=True)
+    tests = extract_python(tests_chain.invoke({"code": code, "testcases": state["test_cases"]}))
+    if not tests.strip() or not is_python(tests):
+        print("YHK: generated tests are not valid Python, QA falls back to an LLM review")
+        return None
+    results = run_tests(code, tests)
+    if results["status"] == UNAVAILABLE:
+        print(f"YHK: tests could not run locally ({results['summary']}), QA falls back to an LLM review")
+        return None
+    print(f"YHK: QA tests {results['status']} in {results['duration_s']}s: {results['summary']}")
+    return dict(results, source=tests)
+
+def _qa_feedback(results: dict) -> str:
+    lines = [f"Executed tests: {results['summary']}"]
+    for test in results["tests"]:
+        if test["outcome"] != PASSED:
+            lines.append(f"- {test['name']} {test['outcome']}: {test['message']}")
+    if results["status"] != PASSED and not results["tests"]:
+        lines.append(f"Output:\n{results['output']}")
+    lines.append(f"Tests:\n{results['source']}")
+    return "\n".join(lines)
+
+def _qa_verdict(state, config: RunnableConfig) -> dict:
+    results = _execute_tests(state, config)
+    if results is None:
+        chain = _chain(config, QA_PROMPT, Review)
+        response = chain.invoke({"code":state['code'],"testcases":state['test_cases']})
+        return dict(_verdict(response), qa_results=None)
+    status = "Approved" if results["status"] == PASSED else "Not Approved"
+    return {"status": status, "feedback": _qa_feedback(results), "qa_results": results}
+
+def qa_testing(state, config: RunnableConfig):
+    """Runs the test cases against the code locally, or has the LLM review them when they cannot run."""
+    ui = _ui(config)
+    ui.progress("🔄 QA Testing in Progress...")
+    verdict, memo = _memoized_review(state, "qa", (state["code"], state["test_cases"]),
+                                     lambda: _qa_verdict(state, config))
+    results = verdict["qa_results"]
+    state['status'] = verdict["status"]
+    state['feedback'] = verdict["feedback"]
+    state['qa_results'] = results
+    state['review_memo'] = memo
+
+    ui.subheader("QA", "QA Testing Results")
+    ui.write("QA", f"**Status:** {state['status']}")
+    if results is None:
+        ui.write("QA", f"**Feedback:** {state['feedback']}")
+    else:
+        ui.write("QA", f"**Executed tests:** {results['summary']} ({results['duration_s']}s)")
+        for test in results["tests"]:
+            icon = "✅" if test["outcome"] == PASSED else "❌"
+            ui.write("QA", f"{icon} `{test['name']}` {test['message']}")
+        ui.code("QA", results["source"], language="python", title="Test code")
+    return state
+
+def decision_qa(state):
+    """Returns the next step based on the executed tests, or on the LLM's QA status."""
+    results = state.get("qa_results")
+    if results:
+        return "Passed" if results["status"] == PASSED else "Failed"
+    if state['status']=="Approved":
+        return "Passed"
+    else:
+        return "Failed"
+
+def fix_code_after_QA_feedback(state, config: RunnableConfig):
+    """ Fixing code after QA testing"""
+    ui = _ui(config)
+    ui.progress("🔄 Fixing Code After QA Feedback...")
+    chain = _chain(config, FIX_QA_PROMPT, parse_text=True)
+    qa_code = _revise_code(
+        config, state["code"],
+        "You are an expert software engineer responsible for fixing code based on QA Feedback.",
+        "QA Feedback", f"{_escalated(state, 'qa', state['feedback'])}\n\n**Test cases:**\n{state['test_cases']}",
+        lambda: chain.invoke({
+            "code": state["code"],
+            "testcases": state["test_cases"],
+            "qa_feedback":_escalated(state, "qa", state['feedback'])}),
+        escalate=_noop_streak(state, "qa") > 0)
+
+    state["noop_fixes"] = _count_noop(state, "qa", state["code"], qa_code)
+    state["code"] = qa_code
+    state["loop_iterations"] = _count_iteration(state, "qa")
+
+    ui.subheader("QA", "Updated Code After QA Feedback")
+    ui.code("QA", state['code'])
+
+    ui.subheader("Code", "Final Code After QA Fixes")
+    ui.code("Code", state['code'])
+    return state
+
+def budgeted(decide, loop: str, final: bool = False):
+    """
+    Wraps a review decision so every loop is bounded: "Budget" is returned when
+    the run is out of time or tokens, or when sending the artifact back would
+    exceed the loop's fix-iteration cap or follow too many no-op fixes. A
+    `final` approval always finishes.
+    """
+    def decide_within_budget(state, config: RunnableConfig):
+        outcome = decide(state)
+        proceeding = outcome in ("Approved", "Passed")
+        budget = get_configurable(config, "budget")
+        if budget is None or (proceeding and final):
+            return outcome
+        iterations = (state.get("loop_iterations") or {}).get(loop, 0)
+        hit = budget.exhausted("" if proceeding else loop, iterations, _noop_streak(state, loop))
+        if hit is None:
+            return outcome
+        budget.hit = hit
+        print(f"YHK: stopping the run: {hit['message']}")
+        return "Budget"
+    decide_within_budget.__name__ = f"{decide.__name__}_{loop}"
+    return decide_within_budget
+
+def route_static_analysis(decide):
+    """
+    Fans out to both LLM reviews when the static analysis passed; otherwise the
+    code goes straight to the fix node (or the run stops on a budget).
+    """
+    def route(state, config: RunnableConfig):
+        outcome = decide(state, config)
+        if outcome == "Approved":
+            return ["Code Review", "Security Review"]
+        return "Fix Code after Reviews" if outcome == "Feedback" else "Budget Exhausted"
+    return route
+
+def fan_out_per_story(decide, path_map: dict, story_node: str, story_input):
+    """
+    Routes to `path_map[outcome]`, except that an approval sends every user
+    story to `story_node` at once when per-story fan-out is on.
+    `story_input(state, index, story)` builds that node's input.
+    """
+    def route(state, config: RunnableConfig):
+        outcome = decide(state, config)
+        stories = state.get("user_stories") or []
+        if outcome == "Approved" and stories and get_configurable(config, "fan_out", FAN_OUT_PER_STORY):
+            return [Send(story_node, story_input(state, index, story)) for index, story in enumerate(stories)]
+        return path_map[outcome]
+    return route
+
+def _design_input(state, index: int, story: str) -> dict:
+    return {"story_index": index, "user_story": story, "user_stories": state["user_stories"]}
+
+def _test_cases_input(state, index: int, story: str) -> dict:
+    return {"story_index": index, "user_story": story, "code": state["code"], "design_docs": state["design_docs"]}
+
+def budget_exhausted_exit(state, config: RunnableConfig):
+    """Ends the run early, keeping the latest user stories, docs, code and test cases."""
+    budget = get_configurable(config, "budget")
+    hit = (budget.hit if budget else None) or {"budget": "unknown", "loop": "", "message": "A run budget was exhausted."}
+    _ui(config).warning("Overview", f"⏹️ Stopped early: {hit['message']} The tabs show the latest artifacts.")
+    return {"budget_exhausted": hit}
+
+#############################################################################
+# 5. Build the LangGraph pipeline
+#############################################################################
+def build_sdlc_graph(checkpointer=None):
+    """Builds and compiles the software development workflow graph."""
+    graph_builder = StateGraph(State)
+
+    graph_builder.add_node("UI User Inputs Requirements", user_inputs_requirements)
+    graph_builder.add_node("Auto-generate User Stories", auto_generate_user_stories)
+    graph_builder.add_node("Product Owner Review", product_owner_review)
+    graph_builder.add_node("Revise User Stories", revise_user_stories)
+    graph_builder.add_node("Create Design Documents Functional and Technical", create_design_documents)
+    graph_builder.add_node("Design Documents for Story", design_documents_for_story)
+    graph_builder.add_node("Merge Design Documents", merge_design_documents)
+    graph_builder.add_node("Design Review", design_review)
+    graph_builder.add_node("Revise Design Documents", revise_design_docs)
+    graph_builder.add_node("Generate Code", generate_code)
+    graph_builder.add_node("Static Analysis", static_analysis)
+    graph_builder.add_node("Code Review", code_review)
+    graph_builder.add_node("Security Review", security_review)
+    graph_builder.add_node("Merge Reviews", merge_reviews)
+    graph_builder.add_node("Fix Code after Reviews", fix_code_after_reviews)
+    graph_builder.add_node("Write Test Cases", write_test_cases)
+    graph_builder.add_node("Write Test Cases for Story", test_cases_for_story)
+    graph_builder.add_node("Merge Test Cases", merge_test_cases)
+    graph_builder.add_node("Test Case Review", test_case_review)
+    graph_builder.add_node("Fix Test Cases After Review", fix_testcases_after_review)
+    graph_builder.add_node("QA Testing", qa_testing)
+    graph_builder.add_node("Fix Code After QA Feedback", fix_code_after_QA_feedback)
+    graph_builder.add_node("Budget Exhausted", budget_exhausted_exit)
+
+    graph_builder.add_edge(START, "UI User Inputs Requirements")
+    graph_builder.add_edge("UI User Inputs Requirements", "Auto-generate User Stories")
+    graph_builder.add_edge("Auto-generate User Stories", "Product Owner Review")
+    # Approved stories and code fan out to one design / test case node per user
+    # story; the merge nodes wait for all of them and join the parts in story order
+    story_routes = {"Approved":"Create Design Documents Functional and Technical", "Feedback":"Revise User Stories", "Budget":"Budget Exhausted"}
+    graph_builder.add_conditional_edges("Product Owner Review",
+                                        fan_out_per_story(budgeted(decision, "user_stories"), story_routes,
+                                                          "Design Documents for Story", _design_input),
+                                        [*story_routes.values(), "Design Documents for Story"])
+    graph_builder.add_edge("Revise User Stories", "Product Owner Review")
+    graph_builder.add_edge("Create Design Documents Functional and Technical", "Design Review")
+    graph_builder.add_edge("Design Documents for Story", "Merge Design Documents")
+    graph_builder.add_edge("Merge Design Documents", "Design Review")
+    graph_builder.add_conditional_edges("Design Review", budgeted(decision, "design"), {"Approved":"Generate Code", "Feedback":"Revise Design Documents", "Budget":"Budget Exhausted"})
+    graph_builder.add_edge("Revise Design Documents", "Design Review")
+    # Every code version is checked locally first; only code that passes goes to the
+    # code and security reviews, which run in parallel and join in "Merge Reviews"
+    for reviewed in ("Generate Code", "Fix Code after Reviews", "Fix Code After QA Feedback"):
+        graph_builder.add_edge(reviewed, "Static Analysis")
+    graph_builder.add_conditional_edges("Static Analysis", route_static_analysis(budgeted(decision, "code_review")),
+                                        ["Code Review", "Security Review", "Fix Code after Reviews", "Budget Exhausted"])
+    graph_builder.add_edge(["Code Review", "Security Review"], "Merge Reviews")
+    review_routes = {"Approved":"Write Test Cases", "Feedback":"Fix Code after Reviews", "Budget":"Budget Exhausted"}
+    graph_builder.add_conditional_edges("Merge Reviews",
+                                        fan_out_per_story(budgeted(decision, "code_review"), review_routes,
+                                                          "Write Test Cases for Story", _test_cases_input),
+                                        [*review_routes.values(), "Write Test Cases for Story"])
+    graph_builder.add_edge("Write Test Cases", "Test Case Review")
+    graph_builder.add_edge("Write Test Cases for Story", "Merge Test Cases")
+    graph_builder.add_edge("Merge Test Cases", "Test Case Review")
+    graph_builder.add_conditional_edges("Test Case Review", budgeted(decision, "test_cases"), {"Approved":"QA Testing", "Feedback":"Fix Test Cases After Review", "Budget":"Budget Exhausted"})
+    graph_builder.add_edge("Fix Test Cases After Review", "Test Case Review")
+    graph_builder.add_conditional_edges("QA Testing", budgeted(decision_qa, "qa", final=True), {"Passed":END, "Failed":"Fix Code After QA Feedback", "Budget":"Budget Exhausted"})
+    graph_builder.add_edge("Budget Exhausted", END)
+
+    return graph_builder.compile(checkpointer=checkpointer)
+
+#############################################################################
+# 6. Process-wide registry of the compiled graph
+#############################################################################
+# Streamlit re-executes streamlit_app.py on every interaction, but this module
+# is imported once per process, so the graph is compiled once and shared by
+# every rerun and session (LLM clients are shared through llm_backend).
+SDLC_MODEL = "gemma2-9b-it"
+# Every completed node is checkpointed here, keyed by run ID (the thread_id).
+# Nothing prunes old runs, so the file grows until it is deleted by hand.
+CHECKPOINT_DB = os.getenv("SDLC_CHECKPOINT_DB", ".sdlc_checkpoints.sqlite")
+
+_registry_lock = threading.Lock()
+_compiled_app = None
+_checkpointer = None
+
+enable_llm_cache()
+
+def get_checkpointer() -> SqliteSaver:
+    global _checkpointer
+    with _registry_lock:
+        if _checkpointer is None:
+            # One connection shared by all sessions; SqliteSaver serializes access to it
+            _checkpointer = SqliteSaver(sqlite3.connect(CHECKPOINT_DB, check_same_thread=False))
+        return _checkpointer
+
+def get_sdlc_app():
+    """
+    Returns the compiled, checkpointed SDLC graph, compiling it on first use only.
+    """
+    global _compiled_app
+    if _compiled_app is None:
+        checkpointer = get_checkpointer()
+        with _registry_lock:
+            if _compiled_app is None:
+                _compiled_app = build_sdlc_graph(checkpointer)
+    return _compiled_app
+
+def get_llm(model_name: str = SDLC_MODEL, api_key: str = ""):
+    """
+    Returns the LLM client for `model_name`. Without `api_key` the process-wide
+    client is shared; with one, a new client is returned for the caller to keep.
+    """
+    # Temperature 0, so reviews are reproducible and repeated prompts hit the response cache
+    if api_key:
+        return make_chat_model(model_name, temperature=0, api_key=api_key)
+    return get_chat_model(model_name, temperature=0)
+
+#############################################################################
+# 7. Resuming and forking checkpointed runs
+#############################################################################
+# A run that fails or is interrupted (e.g. at "QA Testing") keeps a checkpoint
+# after every completed node, so it continues from there instead of starting
+# over at "Auto-generate User Stories".
+def _thread_config(run_id: str) -> dict:
+    return {"configurable": {"thread_id": run_id}}
+
+def get_run_state(run_id: str):
+    """
+    Latest checkpoint of a run; `.next` holds the nodes still to run (empty when finished).
+    """
+    return get_sdlc_app().get_state(_thread_config(run_id))
+
+def run_history(run_id: str) -> list:
+    """
+    Steps the run reached, oldest first, as (label, checkpoint_id) pairs. Each
+    checkpoint is the state just before that step ran, i.e. a point to fork
+    from. Nodes of one step share a label: "Code Review + Security Review", or
+    "Design Documents for Story (x3)" for a per-story fan-out.
+    """
+    history = []
+    for snapshot in get_sdlc_app().get_state_history(_thread_config(run_id)):
+        nodes = [node for node in snapshot.next if node != START]
+        if nodes:
+            counts = {node: nodes.count(node) for node in nodes}
+            label = " + ".join(node if count == 1 else f"{node} (x{count})" for node, count in counts.items())
+            history.append((label, snapshot.config["configurable"]["checkpoint_id"]))
+    return list(reversed(history))
+
+def resume_run(run_id: str, llm, tabs=None) -> dict:
+    """
+    Continues `run_id` from its last completed node and returns the final state.
+    """
+    state = get_run_state(run_id)
+    if not state.next:
+        return state.values
+    return get_sdlc_app().invoke(None, config=build_run_config(llm, tabs, run_id))
+
+def fork_run(run_id: str, checkpoint_id: str) -> str:
+    """
+    Copies the checkpoint `checkpoint_id` of `run_id` into a new run and returns
+    its ID; resuming the new run re-executes the graph from that node onwards
+    while the original run stays untouched.
+    """
+    checkpointer = get_checkpointer()
+    source = checkpointer.get_tuple({"configurable": {"thread_id": run_id, "checkpoint_ns": "",
+                                                      "checkpoint_id": checkpoint_id}})
+    if source is None:
+        raise ValueError(f"Run {run_id} has no checkpoint {checkpoint_id}")
+    fork_id = new_run_id()
+    metadata = dict(source.metadata, source="fork", forked_from={"run_id": run_id, "checkpoint_id": checkpoint_id})
+    checkpointer.put({"configurable": {"thread_id": fork_id, "checkpoint_ns": ""}},
+                     source.checkpoint, metadata, source.checkpoint["channel_versions"])
+    return fork_id
@@ -0,0 +1,298 @@
+"""
+Cheap local checks run on generated code before the LLM code and security
+reviews.
+
+`analyze` parses the Python code and reports:
+
+- syntax errors;
+- undefined names (a name read somewhere but bound nowhere in the module and
+  not a builtin; scopes are not modelled, so this only catches typos and
+  missing imports);
+- unused imports (names used only in string annotations count as used, and
+  imports under `if TYPE_CHECKING:` are not checked);
+- insecure calls: eval/exec, os.system/os.popen, shell=True, pickle loads,
+  yaml.load without a Loader, verify=False;
+- hard-coded secrets: credential-like string literals (long, high-entropy)
+  assigned to password/secret/token/key names, private key blocks and AWS
+  access keys.
+
+Only BLOCKING_CHECKS (syntax errors and secrets) are reliable enough to
+reject code on their own; the other findings are advisory.
+
+Code in another language is not analyzed, nor is unfenced code that does not
+parse, since it may not be Python at all.
+"""
+import ast
+import builtins
+import math
+import re
+from collections import Counter
+
+QUALITY = "quality"
+SECURITY = "security"
+BLOCKING_CHECKS = ("syntax-error", "hardcoded-secret")
+
+_FENCE_RE = re.compile(r"```[ \t]*([\w+#.-]*)[ \t]*\n(.*?)```", re.DOTALL)
+_PYTHON_TAGS = ("python", "py", "python3")
+_MODULE_NAMES = {"__name__", "__file__", "__doc__", "__spec__", "__package__", "__loader__", "__builtins__",
+                 "__path__", "__annotations__", "__dict__"}
+# Whole snake_case segments only (not "passenger" or "bypass"), and not names of
+# things that merely describe a secret (TOKEN_URL, password_field_label)
+_SECRET_NAME_RE = re.compile(r"(^|_)(passw(or)?d|pwd|secrets?|tokens?|api_?key|private_?key|credentials?)($|_)",
+                             re.IGNORECASE)
+_NOT_SECRET_SUFFIX_RE = re.compile(r"_(url|uri|label|field|name|header|prompt|env|path|file)$", re.IGNORECASE)
+# Values that are obviously not real secrets
+_PLACEHOLDER_RE = re.compile(r"^(|x+|\*+|<.*>|\$\{.*\}|changeme|your[_\- ].*|example.*|test|dummy|none|null)$",
+                             re.IGNORECASE)
+# A literal shorter or more repetitive than this is a label ("Bearer"), not a credential
+_SECRET_MIN_LENGTH = 8
+_SECRET_MIN_ENTROPY = 3.0
+_SECRET_PATTERNS = (
+    (re.compile(r"-----BEGIN [A-Z ]*PRIVATE KEY-----"), "Private key embedded in the code"),
+    (re.compile(r"\bAKIA[0-9A-Z]{16}\b"), "AWS access key ID embedded in the code"),
+)
+
+
+def python_source(code: str):
+    """
+    Returns (source, declared) for the Python in `code`: fenced ```python
+    blocks joined with declared=True, or the whole text with declared=False
+    when there are no fences. Returns (None, False) for other languages.
+    """
+    blocks = _FENCE_RE.findall(code)
+    if not blocks:
+        return code, False
+    python = [body for tag, body in blocks if tag.lower() in _PYTHON_TAGS]
+    if python:
+        return "\n\n".join(python), True
+    untagged = [body for tag, body in blocks if not tag]
+    if untagged:
+        return "\n\n".join(untagged), False
+    return None, False
+
+
+def _is_secret_name(name: str) -> bool:
+    # camelCase names are split into segments like snake_case ones
+    name = re.sub(r"(?<=[a-z0-9])(?=[A-Z])", "_", name.rsplit(".", 1)[-1])
+    return bool(_SECRET_NAME_RE.search(name)) and not _NOT_SECRET_SUFFIX_RE.search(name)
+
+
+def _looks_like_secret(value: str) -> bool:
+    value = value.strip()
+    if (len(value) < _SECRET_MIN_LENGTH or any(char.isspace() for char in value) or "://" in value
+            or _PLACEHOLDER_RE.match(value)):
+        return False
+    counts = Counter(value)
+    entropy = -sum(count / len(value) * math.log2(count / len(value)) for count in counts.values())
+    return entropy >= _SECRET_MIN_ENTROPY
+
+
+def _finding(category: str, check: str, line: int, message: str) -> dict:
+    return {"category": category, "check": check, "line": line, "message": message}
+
+
+def _dotted_name(node) -> str:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        base = _dotted_name(node.value)
+        return f"{base}.{node.attr}" if base else ""
+    return ""
+
+
+class _Scanner(ast.NodeVisitor):
+    def __init__(self):
+        self.bound = set(dir(builtins)) | _MODULE_NAMES
+        self.loaded = []
+        self.imports = []
+        # Names read inside string annotations ('List[int]'); they only mark imports as used
+        self.annotation_names = set()
+        self.star_import = False
+        self.type_checking = False
+        self.findings = []
+
+    def _bind(self, name):
+        if name:
+            self.bound.add(name)
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            name = alias.asname or alias.name.split(".")[0]
+            self._bind(name)
+            if not self.type_checking:
+                self.imports.append((name, node.lineno))
+
+    def visit_ImportFrom(self, node):
+        for alias in node.names:
+            if alias.name == "*":
+                self.star_import = True
+                continue
+            name = alias.asname or alias.name
+            self._bind(name)
+            if node.module != "__future__" and not self.type_checking:
+                self.imports.append((name, node.lineno))
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load):
+            self.loaded.append((node.id, node.lineno))
+        else:
+            self._bind(node.id)
+
+    def _string_annotation(self, annotation):
+        for node in ast.walk(annotation) if annotation is not None else ():
+            if isinstance(node, ast.Constant) and isinstance(node.value, str):
+                try:
+                    parsed = ast.parse(node.value.strip(), mode="eval")
+                except SyntaxError:
+                    continue
+                self.annotation_names.update(name.id for name in ast.walk(parsed) if isinstance(name, ast.Name))
+
+    def visit_If(self, node):
+        if _dotted_name(node.test) in ("TYPE_CHECKING", "typing.TYPE_CHECKING"):
+            # Imports only for type checkers; they are usually used in string annotations only
+            outer, self.type_checking = self.type_checking, True
+            for child in node.body:
+                self.visit(child)
+            self.type_checking = outer
+            for child in node.orelse:
+                self.visit(child)
+            self.visit(node.test)
+        else:
+            self.generic_visit(node)
+
+    def visit_FunctionDef(self, node):
+        self._string_annotation(node.returns)
+        self.visit_ClassDef(node)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        self._bind(node.name)
+        self.generic_visit(node)
+
+    def visit_arg(self, node):
+        self._bind(node.arg)
+        self._string_annotation(node.annotation)
+        self.generic_visit(node)
+
+    def visit_ExceptHandler(self, node):
+        self._bind(node.name)
+        self.generic_visit(node)
+
+    def visit_Global(self, node):
+        for name in node.names:
+            self._bind(name)
+
+    visit_Nonlocal = visit_Global
+
+    def visit_MatchAs(self, node):
+        self._bind(node.name)
+        self.generic_visit(node)
+
+    def visit_MatchStar(self, node):
+        self._bind(node.name)
+
+    def visit_MatchMapping(self, node):
+        self._bind(node.rest)
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        name = _dotted_name(node.func)
+        if name in ("eval", "exec"):
+            self.findings.append(_finding(SECURITY, "insecure-call", node.lineno,
+                                          f"{name}() executes arbitrary code; parse the input instead"))
+        elif name in ("os.system", "os.popen"):
+            self.findings.append(_finding(SECURITY, "insecure-call", node.lineno,
+                                          f"{name}() runs a shell command; use subprocess with an argument list"))
+        elif name in ("pickle.loads", "pickle.load", "cPickle.loads", "cPickle.load"):
+            self.findings.append(_finding(SECURITY, "insecure-call", node.lineno,
+                                          f"{name}() can execute code from untrusted data; use json"))
+        elif name == "yaml.load" and not any(keyword.arg == "Loader" for keyword in node.keywords):
+            self.findings.append(_finding(SECURITY, "insecure-call", node.lineno,
+                                          "yaml.load() without a Loader; use yaml.safe_load()"))
+        for keyword in node.keywords:
+            if not isinstance(keyword.value, ast.Constant):
+                continue
+            if keyword.arg == "shell" and keyword.value.value is True:
+                self.findings.append(_finding(SECURITY, "insecure-call", node.lineno,
+                                              f"{name or 'call'}(shell=True) allows shell injection; "
+                                              f"pass an argument list without shell=True"))
+            elif keyword.arg == "verify" and keyword.value.value is False:
+                self.findings.append(_finding(SECURITY, "insecure-call", node.lineno,
+                                              f"{name or 'call'}(verify=False) disables TLS certificate checks"))
+            elif keyword.arg and _is_secret_name(keyword.arg):
+                self._check_secret(keyword.arg, keyword.value, node.lineno)
+        self.generic_visit(node)
+
+    def _check_secret(self, name, value, line):
+        if isinstance(value, ast.Constant) and isinstance(value.value, str) and _looks_like_secret(value.value):
+            self.findings.append(_finding(SECURITY, "hardcoded-secret", line,
+                                          f"Hard-coded secret in '{name}'; read it from the environment or a "
+                                          f"secret store"))
+
+    def visit_Assign(self, node):
+        for target in node.targets:
+            name = _dotted_name(target)
+            if name and _is_secret_name(name):
+                self._check_secret(name, node.value, node.lineno)
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node):
+        self._string_annotation(node.annotation)
+        name = _dotted_name(node.target)
+        if name and node.value is not None and _is_secret_name(name):
+            self._check_secret(name, node.value, node.lineno)
+        self.generic_visit(node)
+
+
+def _exported_names(tree) -> set:
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and any(_dotted_name(target) == "__all__" for target in node.targets)
+                and isinstance(node.value, (ast.List, ast.Tuple))):
+            return {element.value for element in node.value.elts if isinstance(element, ast.Constant)}
+    return set()
+
+
+def analyze(code: str):
+    """
+    Returns the findings for `code` as a list of {"category" (quality or
+    security), "check", "line", "message"} dicts, or None when the code was
+    not analyzed (not Python).
+    """
+    source, declared = python_source(code)
+    if source is None:
+        return None
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError) as e:
+        if not declared:
+            return None
+        return [_finding(QUALITY, "syntax-error", getattr(e, "lineno", 0) or 0, f"Code does not parse: {e}")]
+
+    scanner = _Scanner()
+    scanner.visit(tree)
+    findings = []
+    if not scanner.star_import:
+        reported = set()
+        for name, line in scanner.loaded:
+            if name not in scanner.bound and name not in reported:
+                reported.add(name)
+                findings.append(_finding(QUALITY, "undefined-name", line, f"Undefined name '{name}'"))
+    used = {name for name, _ in scanner.loaded} | scanner.annotation_names | _exported_names(tree)
+    for name, line in scanner.imports:
+        if name not in used:
+            findings.append(_finding(QUALITY, "unused-import", line, f"'{name}' is imported but never used"))
+    findings.extend(scanner.findings)
+    for pattern, message in _SECRET_PATTERNS:
+        for match in pattern.finditer(source):
+            findings.append(_finding(SECURITY, "hardcoded-secret", source.count("\n", 0, match.start()) + 1, message))
+    return sorted(findings, key=lambda finding: finding["line"])
+
+
+def blocking(findings: list) -> list:
+    """The findings that reject the code without an LLM review."""
+    return [finding for finding in findings if finding["check"] in BLOCKING_CHECKS]
+
+
+def format_findings(findings: list) -> str:
+    return "\n".join(f"- line {finding['line']}: {finding['message']} [{finding['check']}]" for finding in findings)
@@ -0,0 +1,87 @@
+"""
+Disk-backed LRU cache for requirements document summaries.
+
+Entries are keyed by a hash of the document text plus the model name, so the
+same document summarized with the same model only costs one LLM round trip.
+Each entry is a small JSON file; the file mtime doubles as the LRU clock and
+the oldest entries are evicted once the directory grows past `max_bytes`.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+DEFAULT_CACHE_DIR = os.getenv("SUMMARY_CACHE_DIR", ".summary_cache")
+DEFAULT_MAX_BYTES = int(os.getenv("SUMMARY_CACHE_MAX_BYTES", str(20 * 1024 * 1024)))
+
+
+class SummaryCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text: str, model_name: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(model_name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, text: str, model_name: str) -> Optional[str]:
+        """
+        Return the cached summary or None. A hit refreshes the entry's LRU position.
+        """
+        path = self._path(self.make_key(text, model_name))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry.get("summary")
+
+    def put(self, text: str, model_name: str, summary: str) -> None:
+        key = self.make_key(text, model_name)
+        entry = {"model": model_name, "summary": summary, "created_at": time.time()}
+        with self._lock:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(entry, f)
+                os.replace(tmp_path, self._path(key))
+                self._evict()
+            except OSError as e:
+                print(f"YHK: summary cache write failed: {e}")
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        # Oldest access first
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -1,11 +1,16 @@
 import streamlit as st
-from agent import initialize_app
-import io
-import pypdf 
+from agent import build_run_config, initialize_app, stream_answer
+from doc_ingest import load_uploaded_file
+from chunking import estimate_tokens
+from token_budget import context_window
+from llm_cache import get_cache_stats
+import time
 import os
-from langchain_groq.chat_models import ChatGroq
 
 
+# Re-render the streamed markdown at most this often, not on every token
+STREAM_RENDER_INTERVAL_S = 0.1
+
 # App title
 st.title("Testcase Generation Agent")
 
@@ -35,23 +40,17 @@ with st.sidebar:
         st.session_state.selected_model = "llama-3.1-8b-instant"
             
     selected_model = st.selectbox("Select Model", model_options, key="selected_model", index=model_options.index(st.session_state.selected_model))
-    
-    # Update the model in session state when changed
-    if selected_model != st.session_state.selected_model:
-        st.session_state.selected_model = selected_model
-        # Create a new LLM instance when model changes
-        st.session_state.llm = ChatGroq(model=selected_model, temperature=0.0)
-    
-    # Initialize LLM if it doesn't exist
-    if "llm" not in st.session_state:
-        st.session_state.llm = ChatGroq(model=selected_model, temperature=0.0)
+            
+    fast_mode = st.checkbox("⚡ Fast mode (skip summary)", key="fast_mode",
+                            help="Generate only the test cases, without the requirements summary.")
             
     reset_button = st.button("🔄 Reset Conversation", key="reset_button")
     if reset_button:
         st.session_state.messages = []   
         st.rerun()
 
-# Initialize the LangGraph application with the selected model
+# Initialize the LangGraph application with the selected model; the graph and
+# the LLM client are shared process-wide, so this is a lookup on every rerun
 app = initialize_app(model_name=st.session_state.selected_model)
 
 # Display chat messages from history
@@ -62,18 +61,28 @@ for message in st.session_state.messages:
 # Get requirements document content
 requirements_docs_content = ""
 if "uploaded_file" in st.session_state and st.session_state.uploaded_file is not None:
-    if st.session_state.uploaded_file.type == "text/plain":
-        requirements_docs_content = st.session_state.uploaded_file.getvalue().decode("utf-8")
-    elif st.session_state.uploaded_file.type == "application/pdf":
-        pdf_reader = pypdf.PdfReader(io.BytesIO(st.session_state.uploaded_file.getvalue()))
-        for page in pdf_reader.pages:
-            requirements_docs_content += page.extract_text()
+    # Extraction is cached by content hash, so reruns never re-parse an unchanged upload
+    try:
+        requirements_docs_content = load_uploaded_file(st.session_state.uploaded_file)
+    except Exception as e:
+        st.error(f"Error reading uploaded file: {e}")
 elif os.path.exists("./content.txt"):  # Check if default file exists
     try:
         with open("./content.txt", "r", encoding='utf-8') as f:
             requirements_docs_content = f.read()
     except Exception as e:
         st.error(f"Error reading default file: {e}")
+
+# Show how much of the selected model's context the document needs
+if requirements_docs_content:
+    document_tokens = estimate_tokens(requirements_docs_content)
+    window = context_window(st.session_state.selected_model)
+    st.sidebar.caption(f"Document ≈ {document_tokens:,} tokens · {st.session_state.selected_model} context {window:,} tokens")
+
+cache_stats = get_cache_stats()
+if cache_stats:
+    st.sidebar.caption(f"LLM cache: {cache_stats['total_hits']:,} hits · {cache_stats['total_misses']:,} misses "
+                       f"· {cache_stats['entries']:,} entries")
                          
 # Main window
 user_request = st.chat_input("Enter your request:")
@@ -92,17 +101,27 @@ if user_request:
         # Process with AI and get response
         with st.chat_message("assistant"):
             with st.spinner("Generating test cases..."):
-                inputs = {"user_request": user_request, "requirements_docs_content": requirements_docs_content}
+                inputs = {"user_request": user_request, "requirements_docs_content": requirements_docs_content,
+                          "fast_mode": fast_mode}
+                # The graph never touches st.session_state; the LLM is injected per run
+                config = build_run_config(st.session_state.llm, st.session_state.selected_model)
                 
                 # Create a placeholder for streaming output
                 response_placeholder = st.empty()
                 
-                # Stream the output
+                # Stream the testcase tokens as they arrive, throttling re-renders
                 total_answer = ""
-                for output in app.stream(inputs):
-                    for node_name, state in output.items():
-                        if 'answer' in state:
-                            total_answer += state['answer']
+                streamed_testcases = ""
+                last_render = 0.0
+                for kind, text in stream_answer(app, inputs, config):
+                    if kind == "token":
+                        streamed_testcases += text
+                        now = time.monotonic()
+                        if now - last_render >= STREAM_RENDER_INTERVAL_S:
+                            response_placeholder.markdown(streamed_testcases + "▌")
+                            last_render = now
+                    else:
+                        total_answer += text
                 response_placeholder.markdown(total_answer)
                 
                 # Add the assistant's response to the chat history
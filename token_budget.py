@@ -0,0 +1,107 @@
+"""
+Prompt token budgets for the models offered in the UI.
+
+Prompt sizes are estimated locally (see chunking.estimate_tokens) and checked
+against each model's context window before anything is sent, so oversized
+documents are compressed, trimmed or chunked to fit, or rejected up front
+instead of failing after a full upload to the provider.
+"""
+import re
+
+from chunking import CHARS_PER_TOKEN, estimate_tokens
+
+MODEL_CONTEXT_WINDOWS = {
+    "llama-3.1-8b-instant": 131072,
+    "llama-3.3-70b-versatile": 131072,
+    "llama3-70b-8192": 8192,
+    "llama3-8b-8192": 8192,
+    "mixtral-8x7b-32768": 32768,
+    "gemma2-9b-it": 8192,
+    "qwen-2.5-32b": 131072,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+DEFAULT_OUTPUT_RESERVE = 1024
+# The local estimate is a heuristic, so never plan to fill the window completely
+SAFETY_MARGIN = 0.9
+# Trimming a document below this fraction of its (compressed) size would test
+# something else than what was uploaded, so such requests are rejected instead
+DEFAULT_MIN_KEEP_RATIO = 0.5
+
+
+class PromptTooLargeError(ValueError):
+    pass
+
+
+def context_window(model_name: str) -> int:
+    return MODEL_CONTEXT_WINDOWS.get(model_name, DEFAULT_CONTEXT_WINDOW)
+
+
+def compress_whitespace(text: str) -> str:
+    """
+    Collapses runs of spaces/tabs and blank lines, which PDF extraction produces a lot of.
+    """
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r" ?\n[ \n]*\n", "\n\n", text)
+    return text.strip()
+
+
+def trim_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cuts `text` to about `max_tokens`, preferring to stop at a paragraph or line break.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    for separator in ("\n\n", "\n"):
+        position = cut.rfind(separator)
+        if position > max_chars // 2:
+            return cut[:position]
+    return cut
+
+
+class TokenBudget:
+    def __init__(self, model_name: str, output_reserve: int = DEFAULT_OUTPUT_RESERVE):
+        self.model_name = model_name
+        self.context_window = context_window(model_name)
+        self.prompt_budget = int(self.context_window * SAFETY_MARGIN) - output_reserve
+
+    def fits(self, prompt: str) -> bool:
+        return estimate_tokens(prompt) <= self.prompt_budget
+
+    def content_budget(self, overhead_text: str = "") -> int:
+        """
+        Tokens left for document content once the fixed part of the prompt is counted.
+        """
+        return self.prompt_budget - estimate_tokens(overhead_text)
+
+    def fit_content(self, content: str, overhead_text: str = "",
+                    min_keep_ratio: float = DEFAULT_MIN_KEEP_RATIO) -> str:
+        """
+        Returns `content` unchanged if it fits next to `overhead_text`, otherwise a
+        whitespace-compressed and, if still needed, trimmed version of it.
+
+        Raises PromptTooLargeError when the prompt cannot fit without dropping
+        more than `1 - min_keep_ratio` of the document.
+        """
+        available = self.content_budget(overhead_text)
+        if available <= 0:
+            raise PromptTooLargeError(
+                f"The prompt alone needs ~{estimate_tokens(overhead_text)} tokens, more than "
+                f"{self.model_name or 'the model'} accepts ({self.context_window} token context)."
+            )
+        if estimate_tokens(content) <= available:
+            return content
+
+        compressed = compress_whitespace(content)
+        compressed_tokens = estimate_tokens(compressed)
+        if compressed_tokens <= available:
+            return compressed
+        if available < compressed_tokens * min_keep_ratio:
+            raise PromptTooLargeError(
+                f"The requirements document (~{compressed_tokens} tokens) is too large for "
+                f"{self.model_name or 'the model'} ({self.context_window} token context). "
+                "Choose a model with a larger context window or narrow the document."
+            )
+        print(f"YHK: trimming requirements from ~{compressed_tokens} to ~{available} tokens for {self.model_name}")
+        return trim_to_tokens(compressed, available)
@@ -0,0 +1,132 @@
+"""
+Typed UI events for the SDLC workflow.
+
+Graph nodes never call Streamlit directly: they describe what to show as
+`UIEvent`s through a `RunUI`, and whoever runs the graph decides where the
+events go. The Streamlit app runs the graph in a background worker
+(sdlc_runner.py) and renders the queued events as they arrive; a page that
+runs the graph itself gets them rendered in place. Headless callers
+(benchmarks, scripts) pass `discard_event` as the sink. Streamlit is only
+imported when something is rendered.
+"""
+import time
+from typing import Callable, NamedTuple, Optional
+
+# Event kinds; each maps to one Streamlit call in render_event
+PROGRESS = "progress"
+SUBHEADER = "subheader"
+WRITE = "write"
+MARKDOWN = "markdown"
+CODE = "code"
+DIVIDER = "divider"
+WARNING = "warning"
+ERROR = "error"
+# Emitted once by the runner after the graph returned or raised
+FINISHED = "finished"
+
+
+class UIEvent(NamedTuple):
+    run_id: str
+    kind: str
+    # Tab to render into ("Code", "QA", ...); "" renders into the current container
+    tab: str = ""
+    body: str = ""
+    # CODE: syntax highlighting language, and an expander title to fold the code into
+    language: Optional[str] = None
+    title: str = ""
+    node: str = ""
+    created: float = 0.0
+
+
+class RunUI:
+    """
+    What a node uses to show output. `sink` receives every event; without one
+    the events are rendered immediately into `tabs` (or plain containers).
+    """
+
+    def __init__(self, run_id: str = "", node: str = "", sink: Optional[Callable] = None, tabs=None):
+        self.run_id = run_id
+        self.node = node
+        self.sink = sink
+        self.tabs = tabs
+
+    def emit(self, kind: str, tab: str = "", body: str = "", language: Optional[str] = None, title: str = ""):
+        event = UIEvent(self.run_id, kind, tab, body, language, title, self.node, time.time())
+        if self.sink is not None:
+            self.sink(event)
+        else:
+            render_event(event, self.tabs)
+
+    def progress(self, text: str):
+        self.emit(PROGRESS, body=text)
+
+    def subheader(self, tab: str, text: str):
+        self.emit(SUBHEADER, tab, text)
+
+    def write(self, tab: str, text: str):
+        self.emit(WRITE, tab, text)
+
+    def markdown(self, tab: str, text: str):
+        self.emit(MARKDOWN, tab, text)
+
+    def code(self, tab: str, code: str, language: Optional[str] = None, title: str = ""):
+        self.emit(CODE, tab, code, language, title)
+
+    def divider(self, tab: str):
+        self.emit(DIVIDER, tab)
+
+    def warning(self, tab: str, text: str):
+        self.emit(WARNING, tab, text)
+
+    def error(self, tab: str, text: str):
+        self.emit(ERROR, tab, text)
+
+
+def discard_event(event: UIEvent):
+    """Sink for headless runs: nodes' output is not shown anywhere."""
+
+
+def in_streamlit_script() -> bool:
+    """True on a thread running a Streamlit script (a page and its reruns)."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return False
+    return get_script_run_ctx(suppress_warning=True) is not None
+
+
+def _render(event: UIEvent):
+    import streamlit as st
+
+    if event.kind in (PROGRESS, WRITE):
+        st.write(event.body)
+    elif event.kind == SUBHEADER:
+        st.subheader(event.body)
+    elif event.kind == MARKDOWN:
+        st.markdown(event.body)
+    elif event.kind == CODE and event.title:
+        with st.expander(event.title):
+            st.code(event.body, language=event.language)
+    elif event.kind == CODE:
+        st.code(event.body, language=event.language)
+    elif event.kind == DIVIDER:
+        st.divider()
+    elif event.kind == WARNING:
+        st.warning(event.body)
+    elif event.kind == ERROR:
+        st.error(event.body)
+
+
+def render_event(event: UIEvent, tabs=None):
+    """
+    Renders one event with Streamlit: into `tabs[event.tab]` when both are
+    given, otherwise into the current container.
+    """
+    if event.kind == FINISHED:
+        return
+    if event.tab and tabs:
+
+        with tabs[event.tab]:
+            _render(event)
+    else:
+        _render(event)
@@ -1,7 +1,6 @@
-import os
 from dotenv import load_dotenv
 import streamlit as st
-from langchain_groq import ChatGroq
+from llm_backend import make_chat_model, require_api_key
 from langchain.prompts import PromptTemplate
 from langgraph.graph import StateGraph, START, END
 from langchain_core.output_parsers import StrOutputParser
@@ -10,10 +9,10 @@ from typing import List, Dict
 
 # Load API keys
 load_dotenv()
-os.environ["GROQ_API_KEY"] = os.getenv("GROQ_API_KEY")
+require_api_key()
 
 # Initialize LLM
-llm = ChatGroq(model="gemma2-9b-it")
+llm = make_chat_model("gemma2-9b-it")
 
 # Define State Class
 class State(TypedDict):